@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Benchmark Script for the Devium REST tester
+Runs each test_* method repeatedly against a fixed local dataset, records
+wall time, request count and bytes transferred, and gates on a baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from firebase_local_server import LocalFirebaseServer, build_synthetic_fixture
+from latency_stats import summarize
+from result_recorder import Status
+from test_project_simple import DeviumProjectTester
+
+# Metrics compared against the baseline, with the statistic used for each
+GATED_METRICS = [
+    ('wall_ms', 'p50'),
+    ('wall_ms', 'p95'),
+    ('requests', 'p50'),
+    ('bytes', 'p50'),
+    ('failed', 'max')
+]
+
+
+def discover_test_methods(names: List[str] = None) -> List[str]:
+    """test_* methods in definition order, optionally filtered by name"""
+    methods = [name for name in vars(DeviumProjectTester) if name.startswith('test_')]
+    if names:
+        unknown = set(names) - set(methods)
+        if unknown:
+            raise ValueError(f"Unknown test methods: {', '.join(sorted(unknown))}")
+        methods = [name for name in methods if name in names]
+    return methods
+
+
+def run_benchmark(server: LocalFirebaseServer, make_tester: Callable[[str], DeviumProjectTester],
+                  methods: List[str], iterations: int, warmup: int = 1) -> Dict[str, Any]:
+    """Time every method `iterations` times; each run gets a fresh tester"""
+    results = {}
+    for method in methods:
+        samples = {'wall_ms': [], 'requests': [], 'bytes': [], 'failed': []}
+        for iteration in range(warmup + iterations):
+            tester = make_tester(server.url)
+            requests_before = server.stats['requests']
+            bytes_before = server.stats['bytes_sent']
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                getattr(tester, method)()
+                elapsed = time.perf_counter() - start
+                tester.recorder.flush()
+            tester.transport.close()
+
+            if iteration < warmup:
+                continue
+            samples['wall_ms'].append(elapsed * 1000)
+            samples['requests'].append(server.stats['requests'] - requests_before)
+            samples['bytes'].append(server.stats['bytes_sent'] - bytes_before)
+            samples['failed'].append(tester.recorder.count(Status.FAILED))
+
+        results[method] = {metric: summarize(values) for metric, values in samples.items()}
+    return results
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    """Per-method results from a --save-baseline file, or from a full --output report"""
+    with open(path, 'r') as f:
+        baseline = json.load(f)
+    if isinstance(baseline, dict) and isinstance(baseline.get('results'), dict) and 'config' in baseline:
+        return baseline['results']
+    return baseline if isinstance(baseline, dict) else {}
+
+
+def comparable_metrics(results: Dict[str, Any], baseline: Dict[str, Any]) -> int:
+    """How many gated (method, metric) pairs exist in both results and baseline"""
+    count = 0
+    for method, metrics in results.items():
+        previous = baseline.get(method)
+        if not isinstance(previous, dict):
+            continue
+        for metric, stat in GATED_METRICS:
+            if isinstance(previous.get(metric), dict) and isinstance(previous[metric].get(stat), (int, float)):
+                count += 1
+    return count
+
+
+def compare_to_baseline(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float,
+                        min_delta_ms: float) -> List[str]:
+    """List regressions where a gated metric grew by more than threshold"""
+    regressions = []
+    for method, metrics in results.items():
+        previous = baseline.get(method)
+        if not isinstance(previous, dict):
+            continue
+        for metric, stat in GATED_METRICS:
+            # Hand-edited or old-format entries are skipped, as in comparable_metrics
+            if not isinstance(previous.get(metric), dict):
+                continue
+            old = previous[metric].get(stat)
+            new = metrics[metric][stat]
+            if not isinstance(old, (int, float)):
+                continue
+            limit = old * (1 + threshold)
+            if metric == 'wall_ms':
+                # Ignore sub-millisecond noise on very fast checks
+                limit = max(limit, old + min_delta_ms)
+            if new > limit:
+                regressions.append(f"{method}: {metric} {stat} {old:.1f} -> {new:.1f} "
+                                   f"(+{(new - old) / old * 100 if old else 100:.0f}%)")
+    return regressions
+
+
+def print_results(results: Dict[str, Any]):
+    print(f"{'Test':<28} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'requests':>9} {'bytes':>10}")
+    print("-" * 78)
+    for method, metrics in results.items():
+        wall = metrics['wall_ms']
+        print(f"{method:<28} {wall['p50']:>9.1f} {wall['p95']:>9.1f} {wall['p99']:>9.1f} "
+              f"{metrics['requests']['p50']:>9.0f} {metrics['bytes']['p50']:>10.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Devium REST tester against a local dataset")
+    parser.add_argument("--fixture", default=None,
+                        help="JSON fixture to serve (default: synthetic dataset)")
+    parser.add_argument("--scale", type=int, default=1, help="synthetic dataset scale")
+    parser.add_argument("--iterations", "-n", type=int, default=10, help="timed runs per test method")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs per test method")
+    parser.add_argument("--tests", nargs="*", default=None, help="only benchmark these test methods")
+    parser.add_argument("--latency", type=float, default=0.0, help="injected server latency in seconds")
+    parser.add_argument("--bandwidth", type=int, default=None, help="server bandwidth cap in bytes/s")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--snapshot", action="store_true")
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--output", default="benchmark_report.json", help="where to write results")
+    parser.add_argument("--baseline", default=None, help="baseline file to compare against")
+    parser.add_argument("--save-baseline", default=None, help="write these results as a new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed relative growth before a metric counts as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0,
+                        help="absolute wall-time slack added to the threshold")
+    args = parser.parse_args()
+
+    if args.fixture:
+        with open(args.fixture, 'r') as f:
+            dataset = json.load(f)
+    else:
+        dataset = build_synthetic_fixture(args.scale)
+
+    def make_tester(url: str) -> DeviumProjectTester:
+        return DeviumProjectTester(database_url=url, max_workers=args.workers, max_retries=0,
+                                   use_snapshot=args.snapshot, page_size=args.page_size,
+                                   stream=args.stream, report_path=None)
+
+    print("⏱️ DEVIUM TESTER BENCHMARK")
+    print("=" * 78)
+    with LocalFirebaseServer(dataset, latency=args.latency, bandwidth=args.bandwidth, seed=0) as server:
+        results = run_benchmark(server, make_tester, discover_test_methods(args.tests), args.iterations, args.warmup)
+    print_results(results)
+
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'config': {key: value for key, value in vars(args).items()
+                   if key not in ('output', 'baseline', 'save_baseline')},
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📄 Benchmark results saved to: {args.output}")
+
+    regressions = []
+    if args.baseline:
+        baseline = load_baseline(args.baseline)
+        if not comparable_metrics(results, baseline):
+            # A baseline of another shape or for other tests would otherwise pass silently
+            print(f"\n❌ Baseline {args.baseline} shares no test methods or metrics with these results")
+            sys.exit(2)
+        regressions = compare_to_baseline(results, baseline, args.threshold, args.min_delta_ms)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"📌 Baseline saved to: {args.save_baseline}")
+
+    if args.baseline:
+        if regressions:
+            print(f"\n❌ {len(regressions)} regressions over {args.threshold * 100:.0f}% threshold:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print("\n✅ No regressions against baseline")
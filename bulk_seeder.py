@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Bulk Seeder for Devium fixtures
+Streams a JSON or NDJSON fixture into chunked multi-path PATCH updates,
+writes the chunks in parallel and checkpoints finished chunks so an
+interrupted load resumes where it stopped
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from firebase_local_server import LocalFirebaseServer
+from firebase_rest import FirebaseRestTransport, split_path
+from json_stream import iter_items_at_depth
+
+# The REST API rejects write bodies over 256 MB; chunks stay far below that
+# so each request is quick to retry and never trips the request timeout
+REST_MAX_WRITE_BYTES = 256 * 1024 * 1024
+DEFAULT_CHUNK_BYTES = 4 * 1024 * 1024
+DEFAULT_CHUNK_PATHS = 1000
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def iter_fixture_paths(source_path: str, depth: int = 2) -> Iterator[Tuple[str, Any]]:
+    """(database path, value) pairs from a fixture, one record at a time
+
+    A .json file is a database export and is split `depth` levels below
+    the root. An .ndjson file has one object per line: either
+    {"path": ..., "value": ...} or a multi-path map of path -> value.
+    """
+    if source_path.endswith(('.ndjson', '.jsonl')):
+        with open(source_path, 'r') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if not isinstance(entry, dict):
+                    raise ValueError(f"{source_path}:{line_number}: expected a JSON object")
+                if set(entry) == {'path', 'value'}:
+                    yield '/'.join(split_path(entry['path'])), entry['value']
+                else:
+                    for path, value in entry.items():
+                        yield '/'.join(split_path(path)), value
+    else:
+        with open(source_path, 'rb') as f:
+            for key_path, value in iter_items_at_depth(f, depth):
+                yield '/'.join(key_path), value
+
+
+def split_oversized(path: str, value: Any, encoded: bytes, max_bytes: int) -> Iterator[Tuple[str, bytes]]:
+    """Break a record bigger than one chunk into writes of its children"""
+    if len(encoded) <= max_bytes:
+        yield path, encoded
+        return
+    if isinstance(value, list):
+        value = {str(index): child for index, child in enumerate(value) if child is not None}
+    if not isinstance(value, dict) or not value:
+        if len(encoded) > REST_MAX_WRITE_BYTES:
+            raise ValueError(f"{path} is {len(encoded)} bytes, over the REST write limit")
+        yield path, encoded
+        return
+    for key, child in value.items():
+        yield from split_oversized(f"{path}/{key}", child, _encode(child), max_bytes)
+
+
+class Chunk:
+    __slots__ = ('index', 'body', 'paths', 'digest')
+
+    def __init__(self, index: int, entries: List[Tuple[str, bytes]]):
+        self.index = index
+        self.paths = len(entries)
+        self.body = b'{' + b','.join(_encode(path) + b':' + encoded for path, encoded in entries) + b'}'
+        # Identifies the chunk's content, so a changed fixture does not resume into the wrong chunks
+        self.digest = hashlib.sha256(self.body).hexdigest()[:16]
+
+
+def iter_chunks(pairs: Iterator[Tuple[str, Any]], max_bytes: int = DEFAULT_CHUNK_BYTES,
+                max_paths: int = DEFAULT_CHUNK_PATHS) -> Iterator[Chunk]:
+    """Group (path, value) pairs into multi-path updates under both limits, in input order"""
+    entries = []
+    size = 2
+    index = 0
+    for path, value in pairs:
+        for entry_path, encoded in split_oversized(path, value, _encode(value), max_bytes):
+            entry_size = len(entry_path) + len(encoded) + 4
+            if entries and (size + entry_size > max_bytes or len(entries) >= max_paths):
+                yield Chunk(index, entries)
+                index += 1
+                entries = []
+                size = 2
+            entries.append((entry_path, encoded))
+            size += entry_size
+    if entries:
+        yield Chunk(index, entries)
+
+
+class SeedCheckpoint:
+    """Chunks already written, persisted (atomically) after each completion batch"""
+
+    def __init__(self, path: Optional[str], source: str, chunk_bytes: int, chunk_paths: int):
+        self.path = path
+        self.key = {'source': os.path.abspath(source), 'chunk_bytes': chunk_bytes, 'chunk_paths': chunk_paths}
+        self.completed = {}
+        self._lock = threading.Lock()
+        self._last_save = 0.0
+        if path:
+            try:
+                with open(path, 'r') as f:
+                    saved = json.load(f)
+            except (OSError, ValueError):
+                saved = {}
+            if saved.get('key') == self.key:
+                self.completed = {int(index): digest for index, digest in saved.get('completed', {}).items()}
+
+    def done(self, chunk: Chunk) -> bool:
+        return self.completed.get(chunk.index) == chunk.digest
+
+    def mark(self, chunk: Chunk, min_interval: float = 1.0):
+        with self._lock:
+            self.completed[chunk.index] = chunk.digest
+            if time.monotonic() - self._last_save >= min_interval:
+                self._save()
+
+    def save(self):
+        with self._lock:
+            self._save()
+
+    def _save(self):
+        if not self.path:
+            return
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({'key': self.key, 'completed': self.completed}, f)
+        os.replace(temp_path, self.path)
+        self._last_save = time.monotonic()
+
+    def remove(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class BulkSeeder:
+    """Write chunks as root-level multi-path PATCHes, max_workers at a time
+
+    Each path in a multi-path update is replaced wholesale, so replaying a
+    chunk after a crash is idempotent.
+    """
+
+    def __init__(self, transport: FirebaseRestTransport, max_workers: int = 8,
+                 params: Optional[Dict[str, str]] = None):
+        self.transport = transport
+        self.max_workers = max(1, max_workers)
+        self.params = dict(params or {})
+        self.params['print'] = 'silent'
+        self.stats = {'chunks': 0, 'skipped_chunks': 0, 'failed_chunks': 0, 'paths': 0, 'bytes': 0}
+        self.failures = []
+        self._stats_lock = threading.Lock()
+
+    def _write(self, chunk: Chunk) -> Optional[str]:
+        try:
+            response = self.transport.request('PATCH', '', params=self.params, data=chunk.body,
+                                              headers={'Content-Type': 'application/json'})
+        except Exception as e:
+            return str(e) or type(e).__name__
+        if response.status_code not in (200, 204):
+            return f"HTTP {response.status_code}: {response.text[:200]}"
+        return None
+
+    def seed(self, chunks: Iterator[Chunk], checkpoint: SeedCheckpoint) -> Dict[str, Any]:
+        """Write every chunk not already in the checkpoint; at most 2 x max_workers are held in memory"""
+        start = time.perf_counter()
+        pending = {}
+
+        def finish(done):
+            for future in done:
+                chunk = pending.pop(future)
+                error = future.result()
+                with self._stats_lock:
+                    if error is None:
+                        self.stats['chunks'] += 1
+                        self.stats['paths'] += chunk.paths
+                        self.stats['bytes'] += len(chunk.body)
+                    else:
+                        self.stats['failed_chunks'] += 1
+                        self.failures.append({'chunk': chunk.index, 'error': error})
+                if error is None:
+                    checkpoint.mark(chunk)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for chunk in chunks:
+                if checkpoint.done(chunk):
+                    self.stats['skipped_chunks'] += 1
+                    continue
+                if len(pending) >= 2 * self.max_workers:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    finish(done)
+                pending[executor.submit(self._write, chunk)] = chunk
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                finish(done)
+        checkpoint.save()
+
+        elapsed = time.perf_counter() - start
+        return dict(self.stats,
+                    elapsed_s=round(elapsed, 3),
+                    paths_per_s=round(self.stats['paths'] / elapsed, 1) if elapsed else 0,
+                    mb_per_s=round(self.stats['bytes'] / elapsed / 1024 / 1024, 2) if elapsed else 0,
+                    failures=self.failures[:20])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-load a JSON/NDJSON fixture with chunked multi-path updates")
+    parser.add_argument("source", help="database export (.json) or path/value lines (.ndjson)")
+    parser.add_argument("--database-url", default=None,
+                        help="database to seed (default: an empty in-process local server, as a dry run)")
+    parser.add_argument("--api-key", default=None)
+    parser.add_argument("--auth-token", default=None, help="sent as the auth query parameter")
+    parser.add_argument("--depth", type=int, default=2, help="split a .json export this many levels deep")
+    parser.add_argument("--chunk-mb", type=float, default=DEFAULT_CHUNK_BYTES / 1024 / 1024,
+                        help="maximum body size of one multi-path update")
+    parser.add_argument("--chunk-paths", type=int, default=DEFAULT_CHUNK_PATHS,
+                        help="maximum paths in one multi-path update")
+    parser.add_argument("--workers", type=int, default=8, help="chunks written in parallel")
+    parser.add_argument("--retries", type=int, default=3, help="transport retries per chunk")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds per chunk request")
+    parser.add_argument("--checkpoint", default=None,
+                        help="resume file (default: <source>.seed-checkpoint.json)")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    args = parser.parse_args()
+
+    chunk_bytes = int(args.chunk_mb * 1024 * 1024)
+    if not 0 < chunk_bytes <= REST_MAX_WRITE_BYTES:
+        parser.error(f"--chunk-mb must be between 0 and {REST_MAX_WRITE_BYTES // 1024 // 1024}")
+
+    checkpoint_path = args.checkpoint or f"{args.source}.seed-checkpoint.json"
+    if args.restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    server = None
+    database_url = args.database_url
+    if database_url is None:
+        # A dry run has nothing to resume into
+        server = LocalFirebaseServer().start()
+        database_url = server.url
+        checkpoint_path = None
+
+    transport = FirebaseRestTransport(database_url, args.api_key, pool_size=args.workers,
+                                      max_retries=args.retries, timeout=args.timeout)
+    checkpoint = SeedCheckpoint(checkpoint_path, args.source, chunk_bytes, args.chunk_paths)
+    seeder = BulkSeeder(transport, max_workers=args.workers,
+                        params={'auth': args.auth_token} if args.auth_token else None)
+
+    print("🌱 DEVIUM BULK SEEDER")
+    print("=" * 60)
+    print(f"Source: {args.source}")
+    print(f"Target: {database_url}")
+    if checkpoint.completed:
+        print(f"Resuming: {len(checkpoint.completed)} chunks already written")
+    print("=" * 60)
+
+    try:
+        chunks = iter_chunks(iter_fixture_paths(args.source, args.depth), chunk_bytes, args.chunk_paths)
+        result = seeder.seed(chunks, checkpoint)
+        if server is not None:
+            result['collections'] = {name: len(value) if isinstance(value, dict) else 1
+                                     for name, value in (server.db.get('') or {}).items()}
+    finally:
+        transport.close()
+        if server is not None:
+            server.stop()
+
+    print(f"✅ Wrote {result['paths']} paths in {result['chunks']} chunks "
+          f"({result['bytes'] / 1024 / 1024:.1f} MB) in {result['elapsed_s']:.2f}s")
+    print(f"  - {result['paths_per_s']:.0f} paths/s, {result['mb_per_s']:.1f} MB/s with {args.workers} workers")
+    if result['skipped_chunks']:
+        print(f"  - {result['skipped_chunks']} chunks skipped (already written)")
+    for name, count in result.get('collections', {}).items():
+        print(f"  - {name}: {count} items")
+    if result['failed_chunks']:
+        print(f"❌ {result['failed_chunks']} chunks failed; re-run to resume from {checkpoint_path}")
+        for failure in result['failures']:
+            print(f"  - chunk {failure['chunk']}: {failure['error']}")
+        raise SystemExit(1)
+    checkpoint.remove()
+    print(f"\n📄 Seeded at {datetime.now().isoformat()}")
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Columnar analytics over the monitoring collections
+errors, performanceMetrics and userMetrics are loaded once into NumPy
+columns (timestamps, categorical codes, values) so error rates per level
+and window, metric percentiles and top offenders are vectorized
+aggregates instead of per-record Python loops
+"""
+
+import math
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HOUR_MS = 60 * 60 * 1000
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError("Columnar analytics need NumPy: pip install numpy")
+
+
+def timestamp_ms(value: Any) -> float:
+    """Epoch milliseconds from a server timestamp or an ISO-8601 string (NaN if neither)"""
+    if isinstance(value, bool):
+        return math.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return math.nan
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp() * 1000
+    return math.nan
+
+
+def iso_ms(value: float) -> Optional[str]:
+    if not math.isfinite(value):
+        return None
+    return datetime.fromtimestamp(value / 1000, tz=timezone.utc).isoformat()
+
+
+# Server timestamps are plain numbers; skip the parsing call for them
+_NUMBER_TYPES = (int, float)
+
+
+def _number(value: Any) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return math.nan
+
+
+class _Encoder:
+    """Dictionary-encode strings into int codes as records stream in"""
+
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def add(self, label: str):
+        code = self.codes.get(label)
+        if code is None:
+            code = self.codes[label] = len(self.codes)
+        self.values.append(code)
+
+    def columns(self) -> Tuple[Any, List[str]]:
+        return np.array(self.values, dtype=np.int32), list(self.codes)
+
+
+class ErrorColumns:
+    __slots__ = ('keys', 'timestamps', 'level_codes', 'levels', 'user_codes', 'users')
+
+    def __init__(self, items: Iterable[Tuple[str, Any]]):
+        require_numpy()
+        keys, timestamps, levels, users = [], [], _Encoder(), _Encoder()
+        for key, record in items:
+            if not isinstance(record, dict):
+                continue
+            keys.append(key)
+            timestamp = record.get('timestamp')
+            timestamps.append(timestamp if type(timestamp) in _NUMBER_TYPES else timestamp_ms(timestamp))
+            levels.add(str(record.get('level') or 'unknown'))
+            users.add(str(record.get('userId') or 'anonymous'))
+        self.keys = keys
+        self.timestamps = np.array(timestamps, dtype=np.float64)
+        self.level_codes, self.levels = levels.columns()
+        self.user_codes, self.users = users.columns()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class MetricColumns:
+    __slots__ = ('keys', 'timestamps', 'name_codes', 'names', 'values')
+
+    def __init__(self, items: Iterable[Tuple[str, Any]]):
+        require_numpy()
+        keys, timestamps, names, values = [], [], _Encoder(), []
+        for key, record in items:
+            if not isinstance(record, dict):
+                continue
+            keys.append(key)
+            timestamp = record.get('timestamp')
+            timestamps.append(timestamp if type(timestamp) in _NUMBER_TYPES else timestamp_ms(timestamp))
+            names.add(str(record.get('name') or 'unknown'))
+            value = record.get('value')
+            values.append(value if type(value) in _NUMBER_TYPES else _number(value))
+        self.keys = keys
+        self.timestamps = np.array(timestamps, dtype=np.float64)
+        self.name_codes, self.names = names.columns()
+        self.values = np.array(values, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class UserMetricColumns:
+    """userMetrics/{userId} counters"""
+    __slots__ = ('user_ids', 'error_counts', 'page_views', 'sessions')
+
+    def __init__(self, items: Iterable[Tuple[str, Any]]):
+        require_numpy()
+        user_ids, error_counts, page_views, sessions = [], [], [], []
+        for user_id, record in items:
+            if not isinstance(record, dict):
+                continue
+            user_ids.append(user_id)
+            error_counts.append(_number(record.get('errorCount')))
+            page_views.append(_number(record.get('pageViews')))
+            sessions.append(_number(record.get('totalSessions')))
+        self.user_ids = user_ids
+        self.error_counts = np.array(error_counts, dtype=np.float64)
+        self.page_views = np.array(page_views, dtype=np.float64)
+        self.sessions = np.array(sessions, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+
+def _top(labels: List[str], counts: Any, top: int) -> List[Dict[str, Any]]:
+    counts = np.nan_to_num(counts, nan=0.0)
+    order = np.argsort(-counts, kind='stable')[:top]
+    return [{'id': labels[index], 'count': int(counts[index])} for index in order if counts[index] > 0]
+
+
+def error_rates(errors: ErrorColumns, window_ms: int = HOUR_MS, max_windows: int = 168,
+                top: int = 5) -> Dict[str, Any]:
+    """Errors per level overall and per time window, plus the users reporting the most errors
+
+    Windows are aligned to the newest error and cover at most max_windows
+    windows back, so a stray ancient timestamp cannot blow up the histogram.
+    """
+    level_count = len(errors.levels)
+    totals = np.bincount(errors.level_codes, minlength=level_count)
+    summary = {'total': len(errors), 'window_ms': window_ms, 'levels': {}, 'top_users': []}
+    if not len(errors):
+        return summary
+
+    finite = np.isfinite(errors.timestamps)
+    newest = errors.timestamps[finite].max() if finite.any() else math.nan
+    window_counts = None
+    if math.isfinite(newest):
+        # Window 0 ends at the newest error; larger indices are older
+        age_windows = ((newest - errors.timestamps[finite]) // window_ms).astype(np.int64)
+        recent = age_windows < max_windows
+        window_count = int(age_windows[recent].max()) + 1
+        window_counts = np.bincount(age_windows[recent] * level_count + errors.level_codes[finite][recent],
+                                    minlength=window_count * level_count).reshape(window_count, level_count)
+
+    for code, level in enumerate(errors.levels):
+        entry = {'count': int(totals[code]), 'share': round(float(totals[code]) / len(errors) * 100, 2)}
+        if window_counts is not None:
+            per_window = window_counts[:, code]
+            peak = int(per_window.argmax())
+            entry.update({
+                'per_window_mean': round(float(per_window.mean()), 3),
+                'peak': int(per_window[peak]),
+                'peak_window_start': iso_ms(newest - (peak + 1) * window_ms),
+                'latest_window': int(per_window[0])
+            })
+        summary['levels'][level] = entry
+
+    if window_counts is not None:
+        summary['windows'] = int(window_counts.shape[0])
+        summary['newest'] = iso_ms(newest)
+    summary['top_users'] = _top(errors.users, np.bincount(errors.user_codes, minlength=len(errors.users)), top)
+    return summary
+
+
+def metric_percentiles(metrics: MetricColumns, percentiles: Tuple[int, ...] = (50, 95, 99),
+                       top: int = 3) -> Dict[str, Any]:
+    """p50/p95/p99 (and mean, max) of each metric, with the keys of its slowest records
+
+    Records are sorted once by (name, value); every metric is then a
+    contiguous, already ordered slice, so percentiles are direct lookups.
+    """
+    summary = {}
+    valid = np.flatnonzero(np.isfinite(metrics.values))
+    if not len(valid):
+        return summary
+    order = valid[np.lexsort((metrics.values[valid], metrics.name_codes[valid]))]
+    codes = metrics.name_codes[order]
+    values = metrics.values[order]
+    boundaries = np.flatnonzero(np.diff(codes)) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [len(codes)]))
+    fractions = np.array(percentiles, dtype=np.float64) / 100
+
+    for start, end in zip(starts, ends):
+        group = values[start:end]
+        # Linear interpolation between order statistics (numpy's default percentile method)
+        positions = fractions * (len(group) - 1)
+        lower = np.floor(positions).astype(np.int64)
+        upper = np.minimum(lower + 1, len(group) - 1)
+        points = group[lower] + (group[upper] - group[lower]) * (positions - lower)
+        entry = {'count': int(end - start), 'mean': round(float(group.mean()), 3), 'max': float(group[-1])}
+        for percentile, point in zip(percentiles, points):
+            entry[f'p{percentile}'] = round(float(point), 3)
+        entry['slowest'] = [metrics.keys[index] for index in order[max(start, end - top):end][::-1]]
+        summary[metrics.names[codes[start]]] = entry
+    return summary
+
+
+def user_offenders(user_metrics: UserMetricColumns, top: int = 5) -> Dict[str, Any]:
+    """Users with the most recorded errors, and errors per page view overall"""
+    error_total = float(np.nansum(user_metrics.error_counts))
+    views_total = float(np.nansum(user_metrics.page_views))
+    return {
+        'users': len(user_metrics),
+        'errors': int(error_total),
+        'page_views': int(views_total),
+        'errors_per_100_views': round(error_total / views_total * 100, 3) if views_total else None,
+        'top_users': _top(user_metrics.user_ids, user_metrics.error_counts, top)
+    }
+
+
+def analyze(errors: Iterable[Tuple[str, Any]] = (), metrics: Iterable[Tuple[str, Any]] = (),
+            user_metrics: Iterable[Tuple[str, Any]] = (), system_analytics: Any = None,
+            window_ms: int = HOUR_MS, top: int = 5) -> Dict[str, Any]:
+    """Load every monitoring collection into columns and compute the report section"""
+    require_numpy()
+    error_columns = ErrorColumns(errors)
+    metric_columns = MetricColumns(metrics)
+    user_columns = UserMetricColumns(user_metrics)
+    analytics = {
+        'errors': error_rates(error_columns, window_ms=window_ms, top=top),
+        'performance': metric_percentiles(metric_columns),
+        'user_metrics': user_offenders(user_columns, top=top)
+    }
+    if isinstance(system_analytics, dict):
+        # Dashboard counters as the app last wrote them
+        analytics['system'] = {key: value for key, value in system_analytics.items()
+                               if isinstance(value, (int, float)) and not isinstance(value, bool)}
+    return analytics
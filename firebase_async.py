@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Asyncio Firebase REST transport for the Devium test scripts
+One aiohttp connection pool per event loop, with a semaphore bounding
+in-flight requests, per-request timeouts and the same retry and tracing
+behaviour as the synchronous transport
+"""
+
+import asyncio
+import json
+import random
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from firebase_rest import IDEMPOTENT_METHODS, RETRY_STATUSES, key_page_keys, key_page_params
+from firebase_tracing import TraceHook, NullTraceHook, TraceRecord, current_test
+
+
+class AsyncResponse:
+    """Status, headers and fully read body of one REST call"""
+    __slots__ = ('status_code', 'headers', 'content')
+
+    def __init__(self, status_code: int, headers: Dict[str, str], content: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    def json(self) -> Any:
+        return json.loads(self.content) if self.content else None
+
+
+class AsyncFirebaseTransport:
+    """aiohttp session for the Firebase Realtime Database REST API
+
+    open() must run inside the event loop that will use the transport;
+    aclose() releases the pool. close() only closes the trace hook, so it
+    can be called from synchronous code like FirebaseRestTransport.close().
+    """
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None, pool_size: int = 100,
+                 max_in_flight: int = 100, max_retries: int = 3, backoff_base: float = 0.5,
+                 backoff_cap: float = 8.0, timeout: float = 10, trace_hook: Optional[TraceHook] = None):
+        if aiohttp is None:
+            raise ImportError("The async backend needs aiohttp: pip install aiohttp")
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.pool_size = max(1, pool_size)
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = timeout
+        self.retry_count = 0
+        self.trace_hook = trace_hook or NullTraceHook()
+        parts = urlsplit(self.base_url)
+        self._host = f"{parts.scheme}://{parts.netloc.rsplit('@', 1)[-1]}"
+        self._requests = 0
+        self._connections_opened = 0
+        self._session = None
+        self._semaphore = None
+
+    def url_for(self, path: str) -> str:
+        """Build the REST URL for a database path"""
+        return f"{self.base_url}/{path.strip('/')}.json"
+
+    async def open(self):
+        """Create the connection pool on the running event loop"""
+        if self._session is not None:
+            return
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_connection_create_start.append(self._on_connection_create_start)
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+
+        connector = aiohttp.TCPConnector(limit=self.pool_size, limit_per_host=self.pool_size)
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            headers={'Accept': 'application/json', 'Accept-Encoding': 'gzip'},
+            trace_configs=[trace_config]
+        )
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+
+    async def aclose(self):
+        """Close the connection pool (the transport can be reopened on another loop)"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            self._semaphore = None
+
+    def close(self):
+        self.trace_hook.close()
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def _on_request_start(self, session, context, params):
+        self._requests += 1
+
+    async def _on_connection_create_start(self, session, context, params):
+        context.connect_started = time.perf_counter()
+
+    async def _on_connection_create_end(self, session, context, params):
+        request_context = context.trace_request_ctx
+        if request_context is not None:
+            request_context.connect += time.perf_counter() - context.connect_started
+        self._connections_opened += 1
+
+    async def request(self, method: str, path: str, params: Optional[Dict[str, Any]] = None,
+                      json_body: Any = None, headers: Optional[Dict[str, str]] = None,
+                      idempotent: Optional[bool] = None) -> AsyncResponse:
+        """Send a request, retrying 429/5xx, connection errors and timeouts with backoff
+
+        As in FirebaseRestTransport, only idempotent methods are retried
+        unless the caller passes idempotent=True.
+        """
+        await self.open()
+        query = {name: str(value) for name, value in (params or {}).items()}
+        if self.api_key:
+            query.setdefault('key', self.api_key)
+        url = self.url_for(path)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        max_retries = self.max_retries if idempotent else 0
+
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            retry_after = None
+            context = SimpleNamespace(connect=0.0)
+            attempt_started = time.perf_counter()
+            try:
+                async with self._semaphore:
+                    async with self._session.request(method, url, params=query, json=json_body,
+                                                     headers=headers, timeout=timeout,
+                                                     trace_request_ctx=context) as response:
+                        headers_at = time.perf_counter()
+                        content = await response.read()
+                        result = AsyncResponse(response.status, dict(response.headers), content)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt >= max_retries:
+                    self._trace(method, path, params, None, started, attempt_started, attempt_started,
+                                context.connect, attempt, error=e)
+                    raise
+            else:
+                if result.status_code not in RETRY_STATUSES or attempt >= max_retries:
+                    self._trace(method, path, params, result, started, attempt_started, headers_at,
+                                context.connect, attempt)
+                    return result
+                retry_after = result.headers.get('Retry-After')
+
+            await asyncio.sleep(self._backoff_delay(attempt, retry_after))
+            attempt += 1
+            self.retry_count += 1
+
+    def _trace(self, method: str, path: str, params: Optional[Dict[str, Any]],
+               response: Optional[AsyncResponse], started: float, attempt_started: float,
+               headers_at: float, connect: float, retries: int, error: Optional[Exception] = None):
+        if isinstance(self.trace_hook, NullTraceHook):
+            return
+        finished = time.perf_counter()
+        trace = TraceRecord(
+            method=method,
+            path=path.strip('/'),
+            params={name: value for name, value in (params or {}).items() if name != 'key'},
+            connect_ms=connect * 1000,
+            total_ms=(finished - started) * 1000,
+            retries=retries,
+            test=current_test(),
+            timestamp=datetime.now().isoformat(),
+            error=str(error) if error is not None else None
+        )
+        if response is not None:
+            trace.status = response.status_code
+            trace.ttfb_ms = max(0.0, headers_at - attempt_started - connect) * 1000
+            trace.download_ms = (finished - headers_at) * 1000
+            trace.bytes = len(response.content)
+        self.trace_hook.record(trace)
+
+    async def get(self, path: str, params: Optional[Dict[str, Any]] = None,
+                  headers: Optional[Dict[str, str]] = None) -> AsyncResponse:
+        """GET a database path"""
+        return await self.request('GET', path, params=params, headers=headers)
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After when present"""
+        if retry_after:
+            try:
+                return min(self.backoff_cap, float(retry_after))
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def connection_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Request and connection counts, in FirebaseRestTransport's per-host format"""
+        if not self._requests:
+            return {}
+        reused = max(0, self._requests - self._connections_opened)
+        return {
+            self._host: {
+                'requests': self._requests,
+                'connections_opened': self._connections_opened,
+                'connections_reused': reused,
+                'reuse_rate': reused / self._requests * 100
+            }
+        }
+
+
+async def aiter_key_pages(fetch: Callable[[str, Dict], Awaitable[Any]], path: str,
+                          page_size: int = 500) -> AsyncIterator[Tuple[str, Any]]:
+    """Async counterpart of iter_key_pages: (key, value) pairs in key order
+
+    The next page is requested as soon as the current one arrives, so the
+    caller's processing overlaps the following round trip.
+    """
+    page_size = max(1, page_size)
+    last_key = None
+    params = key_page_params(page_size)
+    pending = asyncio.ensure_future(fetch(path, params))
+    while True:
+        page, keys = key_page_keys(await pending, last_key)
+        if not page or len(page) < params['limitToFirst'] or not keys:
+            for key in keys:
+                yield key, page[key]
+            return
+
+        last_key = keys[-1]
+        params = key_page_params(page_size, last_key)
+        pending = asyncio.ensure_future(fetch(path, params))
+        try:
+            for key in keys:
+                yield key, page[key]
+        except BaseException:
+            pending.cancel()
+            raise
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Persistent ETag cache for Firebase REST reads
+Response bodies are kept on disk with their ETag between runs and
+revalidated with conditional requests, so unchanged paths are served
+locally instead of being downloaded again
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+class ETagCache:
+    """Size-bounded LRU cache of response bodies keyed by request URL
+
+    The index (key -> etag, file, size, last_used) is written to
+    index.json on save(); bodies live in one file each. When the total
+    body size exceeds max_bytes the least recently used entries are
+    evicted.
+    """
+
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, directory: str = '.devium_cache', max_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max(0, max_bytes)
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+        # The limit may have shrunk since the cache was written
+        self._evict()
+
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, self.INDEX_FILE)
+
+    def _body_path(self, file_name: str) -> str:
+        return os.path.join(self.directory, file_name)
+
+    def _load_index(self):
+        try:
+            with open(self._index_path(), 'r') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        # Drop entries whose body file went missing
+        self._entries = {key: entry for key, entry in entries.items()
+                         if os.path.exists(self._body_path(entry['file']))}
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(entry['size'] for entry in self._entries.values())
+
+    def lookup(self, key: str) -> Optional[str]:
+        """ETag to revalidate with, if the key is cached"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry['etag'] if entry else None
+
+    def load(self, key: str) -> Optional[bytes]:
+        """Cached body for a key whose ETag was confirmed by a 304 (counts as a hit)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            try:
+                with open(self._body_path(entry['file']), 'rb') as f:
+                    body = f.read()
+            except OSError:
+                del self._entries[key]
+                self._dirty = True
+                return None
+            entry['last_used'] = time.time()
+            self._dirty = True
+            self.hits += 1
+            self.bytes_saved += len(body)
+            return body
+
+    def store(self, key: str, etag: str, body: bytes):
+        """Save a freshly downloaded body (counts as a miss) and evict down to max_bytes"""
+        file_name = hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json'
+        temp_path = self._body_path(file_name + '.tmp')
+        with self._lock:
+            self.misses += 1
+            if len(body) > self.max_bytes:
+                return
+            with open(temp_path, 'wb') as f:
+                f.write(body)
+            os.replace(temp_path, self._body_path(file_name))
+            self._entries[key] = {'etag': etag, 'file': file_name, 'size': len(body), 'last_used': time.time()}
+            self._dirty = True
+            self._evict()
+
+    def record_miss(self):
+        """Count a download that could not be cached (e.g. no ETag returned)"""
+        with self._lock:
+            self.misses += 1
+
+    def _evict(self):
+        total = self.size_bytes
+        for key in sorted(self._entries, key=lambda name: self._entries[name]['last_used']):
+            if total <= self.max_bytes:
+                break
+            entry = self._entries.pop(key)
+            total -= entry['size']
+            self.evictions += 1
+            self._dirty = True
+            try:
+                os.remove(self._body_path(entry['file']))
+            except OSError:
+                pass
+
+    def save(self):
+        """Persist the index (atomically) if it changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            temp_path = self._index_path() + '.tmp'
+            with open(temp_path, 'w') as f:
+                json.dump(self._entries, f)
+            os.replace(temp_path, self._index_path())
+            self._dirty = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups * 100) if lookups > 0 else 0,
+                'bytes_saved': self.bytes_saved,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'size_bytes': self.size_bytes
+            }
+
+
+def conditional_get(transport: Any, cache: ETagCache, path: str) -> Tuple[Optional[int], Any]:
+    """GET a path through the cache, returning (status, parsed body)
+
+    Asks Firebase for an ETag and sends If-None-Match when a body is
+    cached; a 304 is answered from disk.
+    """
+    key = transport.url_for(path)
+    headers = {'X-Firebase-ETag': 'true'}
+    etag = cache.lookup(key)
+    if etag:
+        headers['If-None-Match'] = etag
+
+    response = transport.get(path, headers=headers)
+    if response.status_code == 304:
+        body = cache.load(key)
+        if body is not None:
+            return 200, json.loads(body)
+        # Evicted between lookup and load: fetch unconditionally
+        response = transport.get(path, headers={'X-Firebase-ETag': 'true'})
+
+    if response.status_code != 200:
+        return response.status_code, None
+    new_etag = response.headers.get('ETag')
+    if new_etag:
+        cache.store(key, new_etag, response.content)
+    else:
+        cache.record_miss()
+    return 200, response.json()
@@ -0,0 +1,725 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Firebase Realtime Database REST API
+Serves a JSON fixture in-process so the testers can run offline and be
+benchmarked reproducibly, with optional injected latency, bandwidth caps
+and error rates
+"""
+
+import argparse
+import base64
+import gzip
+import hashlib
+import json
+import queue
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+from firebase_rest import FirebaseRestTransport, split_path, walk_tree, key_sort_order
+
+PUSH_CHARS = '-0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz'
+
+
+def value_sort_order(value: Any) -> Tuple:
+    """RTDB child ordering: null, false, true, numbers, strings, then objects"""
+    if value is None:
+        return (0, 0, '')
+    if value is False:
+        return (1, 0, '')
+    if value is True:
+        return (2, 0, '')
+    if isinstance(value, (int, float)):
+        return (3, value, '')
+    if isinstance(value, str):
+        return (4, 0, value)
+    return (5, 0, '')
+
+
+class LocalFirebaseDatabase:
+    """Thread-safe in-memory JSON tree with RTDB REST query semantics"""
+
+    def __init__(self, data: Any = None):
+        self.root = data if data is not None else {}
+        self.lock = threading.RLock()
+        self._last_push_time = 0
+        self._last_push_suffix = []
+        self._listeners = []
+
+    def subscribe(self, listener: Callable[[str, str, Any], None]):
+        """Call listener(event, path, data) after every write, with the lock held"""
+        with self.lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[str, str, Any], None]):
+        with self.lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _notify(self, event: str, path: str, data: Any):
+        for listener in list(self._listeners):
+            listener(event, path, data)
+
+    def get(self, path: str) -> Any:
+        with self.lock:
+            return walk_tree(self.root, split_path(path))
+
+    def set(self, path: str, value: Any):
+        with self.lock:
+            self._set(path, value)
+            self._notify('put', path, value)
+
+    def _set(self, path: str, value: Any):
+        with self.lock:
+            segments = split_path(path)
+            if not segments:
+                self.root = value if value is not None else {}
+                return
+            parent = self._container(segments[:-1])
+            key = segments[-1]
+            if value is None:
+                if isinstance(parent, dict):
+                    parent.pop(key, None)
+                elif isinstance(parent, list) and key.isdigit() and int(key) < len(parent):
+                    parent[int(key)] = None
+            elif isinstance(parent, list) and key.isdigit() and int(key) < len(parent):
+                parent[int(key)] = value
+            else:
+                parent[key] = value
+
+    def update(self, path: str, values: Dict[str, Any]):
+        """Multi-path update: each key may itself be a relative path"""
+        with self.lock:
+            base = '/'.join(split_path(path))
+            for relative_path, value in values.items():
+                self._set(f"{base}/{relative_path}" if base else relative_path, value)
+            self._notify('patch', path, values)
+
+    def push(self, path: str, value: Any) -> str:
+        with self.lock:
+            key = self.next_push_id()
+            base = '/'.join(split_path(path))
+            self.set(f"{base}/{key}" if base else key, value)
+            return key
+
+    def next_push_id(self) -> str:
+        """Chronologically ordered 20-character push id, like the client SDKs"""
+        now = int(time.time() * 1000)
+        if now == self._last_push_time and self._last_push_suffix:
+            # Same millisecond: increment the random suffix to keep ordering
+            for index in range(11, -1, -1):
+                if self._last_push_suffix[index] != 63:
+                    self._last_push_suffix[index] += 1
+                    break
+                self._last_push_suffix[index] = 0
+        else:
+            self._last_push_suffix = [random.randrange(64) for _ in range(12)]
+        self._last_push_time = now
+
+        prefix = []
+        for _ in range(8):
+            prefix.append(PUSH_CHARS[now % 64])
+            now //= 64
+        return ''.join(reversed(prefix)) + ''.join(PUSH_CHARS[index] for index in self._last_push_suffix)
+
+    def _container(self, segments: List[str]) -> Any:
+        """Walk to the node at segments, creating objects along the way"""
+        if not isinstance(self.root, (dict, list)):
+            self.root = {}
+        node = self.root
+        for segment in segments:
+            if isinstance(node, list) and segment.isdigit() and int(segment) < len(node):
+                child = node[int(segment)]
+                if not isinstance(child, (dict, list)):
+                    child = {}
+                    node[int(segment)] = child
+            else:
+                if isinstance(node, list):
+                    # Writing a non-index key turns an array into an object
+                    raise ValueError(f"Cannot write key '{segment}' into an array")
+                child = node.get(segment)
+                if not isinstance(child, (dict, list)):
+                    child = {}
+                    node[segment] = child
+            node = child
+        return node
+
+
+# Query parameters that change the response (ETags are only served without them)
+QUERY_PARAMS = {'shallow', 'orderBy', 'startAt', 'endAt', 'equalTo', 'limitToFirst', 'limitToLast'}
+
+
+def etag_for(body: bytes) -> str:
+    """Content hash used as the ETag of a serialized node"""
+    return base64.b64encode(hashlib.sha1(body).digest()).decode('ascii')
+
+
+def apply_query(node: Any, query: Dict[str, Any]) -> Any:
+    """Apply shallow / orderBy / startAt / endAt / equalTo / limitTo* to a node"""
+    if query.get('shallow'):
+        if isinstance(node, list):
+            node = {str(index): value for index, value in enumerate(node) if value is not None}
+        if isinstance(node, dict):
+            return {key: True if isinstance(value, (dict, list)) else value for key, value in node.items()}
+        return node
+
+    order_by = query.get('orderBy')
+    if order_by is None or not isinstance(node, (dict, list)):
+        return node
+    if isinstance(node, list):
+        node = {str(index): value for index, value in enumerate(node) if value is not None}
+
+    if order_by == '$key':
+        def sort_key(item):
+            return key_sort_order(item[0])
+
+        def bound_key(value):
+            return key_sort_order(str(value))
+    else:
+        if order_by == '$value':
+            def extract(item):
+                return item[1]
+        elif order_by == '$priority':
+            def extract(item):
+                return None
+        else:
+            child_segments = split_path(order_by)
+
+            def extract(item):
+                return walk_tree(item[1], child_segments)
+
+        def sort_key(item):
+            return value_sort_order(extract(item)) + key_sort_order(item[0])
+
+        def bound_key(value):
+            return value_sort_order(value)
+
+    items = sorted(node.items(), key=sort_key)
+    if 'equalTo' in query:
+        query = dict(query, startAt=query['equalTo'], endAt=query['equalTo'])
+    if 'startAt' in query:
+        low = bound_key(query['startAt'])
+        items = [item for item in items if sort_key(item)[:len(low)] >= low]
+    if 'endAt' in query:
+        high = bound_key(query['endAt'])
+        items = [item for item in items if sort_key(item)[:len(high)] <= high]
+    if 'limitToFirst' in query:
+        items = items[:int(query['limitToFirst'])]
+    if 'limitToLast' in query:
+        items = items[-int(query['limitToLast']):] if int(query['limitToLast']) > 0 else []
+    return dict(items)
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'DeviumLocalRTDB/1.0'
+    # Headers and body are written separately; Nagle would stall keep-alive responses
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.backend.verbose:
+            super().log_message(format, *args)
+
+    def _parse(self) -> Tuple[str, Dict[str, Any]]:
+        parsed = urlparse(self.path)
+        path = unquote(parsed.path)
+        if not path.endswith('.json'):
+            raise ValueError("Paths must end in .json")
+        query = {}
+        for name, values in parse_qs(parsed.query).items():
+            raw = values[-1]
+            if name == 'shallow':
+                query[name] = raw == 'true'
+            elif name in ('orderBy', 'startAt', 'endAt', 'equalTo'):
+                query[name] = json.loads(raw)
+            elif name in ('limitToFirst', 'limitToLast'):
+                query[name] = int(raw)
+            else:
+                query[name] = raw
+        return path[:-len('.json')], query
+
+    def _read_body(self) -> Any:
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        return json.loads(raw) if raw else None
+
+    def _send_json(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        self._send_body(status, body, headers)
+
+    def _send_write(self, query: Dict[str, Any], payload: Any):
+        """Echo a write's result, or answer 204 with no body for print=silent"""
+        if query.get('print') == 'silent':
+            self._send_body(204, b'')
+        else:
+            self._send_json(200, payload)
+
+    def _send_get(self, path: str, query: Dict[str, Any]):
+        """GET with ETag support: X-Firebase-ETag asks for one, If-None-Match revalidates"""
+        node = apply_query(self.server.backend.db.get(path), query)
+        body = json.dumps(node, separators=(',', ':')).encode('utf-8')
+        if self.headers.get('X-Firebase-ETag') != 'true' or QUERY_PARAMS & set(query):
+            self._send_body(200, body)
+            return
+
+        etag = etag_for(body)
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self._send_body(200, body, {'ETag': etag})
+
+    def _stream_events(self, path: str):
+        """Serve text/event-stream: an initial put, then put/patch events for writes under path"""
+        backend = self.server.backend
+        db = backend.db
+        watched = split_path(path)
+        events = queue.Queue()
+
+        def emit(event: str, relative: str, data: Any):
+            # Serialized immediately (under the database lock) so later writes cannot leak in
+            payload = json.dumps({'path': relative, 'data': data}, separators=(',', ':'))
+            events.put(f"event: {event}\ndata: {payload}\n\n".encode('utf-8'))
+
+        def listener(event: str, changed_path: str, data: Any):
+            changed = split_path(changed_path)
+            if changed[:len(watched)] == watched:
+                emit(event, '/' + '/'.join(changed[len(watched):]), data)
+            elif watched[:len(changed)] == changed:
+                if event == 'patch' and isinstance(data, dict):
+                    # Only the patched paths that overlap the watched path matter
+                    for relative_path, value in data.items():
+                        target = changed + split_path(relative_path)
+                        if target[:len(watched)] == watched:
+                            emit('put', '/' + '/'.join(target[len(watched):]), value)
+                        elif watched[:len(target)] == target:
+                            emit('put', '/', db.get(path))
+                else:
+                    # A write above the watched path replaces it wholesale
+                    emit('put', '/', db.get(path))
+
+        with db.lock:
+            emit('put', '/', db.get(path))
+            db.subscribe(listener)
+
+        self.close_connection = True
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            last_write = time.monotonic()
+            while not backend.stopping.is_set():
+                try:
+                    message = events.get(timeout=0.5)
+                except queue.Empty:
+                    if time.monotonic() - last_write < backend.keepalive_interval:
+                        continue
+                    message = b"event: keep-alive\ndata: null\n\n"
+                self.wfile.write(f"{len(message):x}\r\n".encode('ascii') + message + b"\r\n")
+                self.wfile.flush()
+                last_write = time.monotonic()
+                with backend._stats_lock:
+                    backend.stats['bytes_sent'] += len(message)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            db.unsubscribe(listener)
+
+    def _send_body(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None):
+        backend = self.server.backend
+        if 'gzip' in (self.headers.get('Accept-Encoding') or '') and len(body) > 1024:
+            body = gzip.compress(body)
+            headers = dict(headers or {}, **{'Content-Encoding': 'gzip'})
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        backend.throttled_write(self.wfile, body)
+
+    def _handle(self, method: str):
+        backend = self.server.backend
+        backend.record_request()
+        try:
+            path, query = self._parse()
+        except ValueError as e:
+            self._send_json(400, {'error': str(e)})
+            return
+        body = self._read_body() if method in ('PUT', 'PATCH', 'POST') else None
+
+        backend.inject_latency()
+        if backend.should_fail():
+            self._send_json(503, {'error': 'Injected failure'})
+            return
+
+        try:
+            if method == 'GET' and 'text/event-stream' in (self.headers.get('Accept') or ''):
+                self._stream_events(path)
+            elif method == 'GET':
+                self._send_get(path, query)
+            elif method == 'PUT':
+                backend.db.set(path, body)
+                self._send_write(query, body)
+            elif method == 'PATCH':
+                if not isinstance(body, dict):
+                    self._send_json(400, {'error': 'PATCH body must be an object'})
+                    return
+                backend.db.update(path, body)
+                self._send_write(query, body)
+            elif method == 'POST':
+                self._send_write(query, {'name': backend.db.push(path, body)})
+            elif method == 'DELETE':
+                backend.db.set(path, None)
+                self._send_write(query, None)
+        except (ValueError, TypeError) as e:
+            self._send_json(400, {'error': str(e)})
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def do_PATCH(self):
+        self._handle('PATCH')
+
+    def do_POST(self):
+        # Firebase REST clients may tunnel other verbs through POST
+        override = (self.headers.get('X-HTTP-Method-Override') or 'POST').upper()
+        self._handle(override if override in ('PUT', 'PATCH', 'DELETE') else 'POST')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class LocalFirebaseServer:
+    """In-process HTTP server implementing the RTDB REST subset the testers use"""
+
+    def __init__(self, data: Any = None, host: str = '127.0.0.1', port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, bandwidth: Optional[int] = None,
+                 error_rate: float = 0.0, seed: Optional[int] = None, verbose: bool = False):
+        self.db = LocalFirebaseDatabase(data)
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.verbose = verbose
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {'requests': 0, 'bytes_sent': 0, 'errors_injected': 0}
+
+        # Event streams send keep-alive events when idle and end when the server stops
+        self.keepalive_interval = 15.0
+        self.stopping = threading.Event()
+
+        self._httpd = _Server((host, port), _RequestHandler)
+        self._httpd.backend = self
+        self._thread = None
+
+    @classmethod
+    def from_fixture(cls, fixture_path: str, **kwargs) -> 'LocalFirebaseServer':
+        """Create a server seeded from a JSON fixture file"""
+        with open(fixture_path, 'r') as f:
+            return cls(json.load(f), **kwargs)
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'LocalFirebaseServer':
+        if self._thread is None:
+            self.stopping.clear()
+            self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self.stopping.set()
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> 'LocalFirebaseServer':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def record_request(self):
+        with self._stats_lock:
+            self.stats['requests'] += 1
+
+    def inject_latency(self):
+        delay = self.latency
+        if self.jitter:
+            with self._random_lock:
+                delay += self._random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def should_fail(self) -> bool:
+        if self.error_rate <= 0:
+            return False
+        with self._random_lock:
+            failed = self._random.random() < self.error_rate
+        if failed:
+            with self._stats_lock:
+                self.stats['errors_injected'] += 1
+        return failed
+
+    def throttled_write(self, wfile, body: bytes):
+        """Write a response body, pacing it to the configured bandwidth"""
+        if not self.bandwidth:
+            wfile.write(body)
+        else:
+            chunk_size = max(1024, self.bandwidth // 20)
+            for offset in range(0, len(body), chunk_size):
+                chunk = body[offset:offset + chunk_size]
+                wfile.write(chunk)
+                wfile.flush()
+                time.sleep(len(chunk) / self.bandwidth)
+        with self._stats_lock:
+            self.stats['bytes_sent'] += len(body)
+
+
+def build_synthetic_fixture(scale: int = 1, seed: int = 42) -> Dict[str, Any]:
+    """Deterministic Devium-shaped dataset; scale multiplies every collection"""
+    rng = random.Random(seed)
+    roles = ['admin', 'manager', 'developer', 'developer', 'tester']
+    statuses = ['active', 'planning', 'completed', 'on-hold']
+    levels = ['error', 'warning', 'info', 'critical']
+    metric_names = ['page_load', 'api_latency', 'render_time', 'memory_usage']
+    base_time = 1700000000000
+
+    users = {}
+    for index in range(20 * scale):
+        uid = f"user{index:06d}"
+        users[uid] = {
+            'name': f"User {index}",
+            'email': f"user{index}@devium.dev",
+            'role': roles[index % len(roles)],
+            'isOnline': rng.random() < 0.3,
+            'createdAt': base_time + index * 1000
+        }
+    user_ids = sorted(users)
+
+    teams = {}
+    for index in range(4 * scale):
+        teams[f"team{index:05d}"] = {
+            'name': f"Team {index}",
+            'members': rng.sample(user_ids, min(5, len(user_ids))),
+            'projects': []
+        }
+    team_ids = sorted(teams)
+
+    projects = {}
+    for index in range(8 * scale):
+        team_id = team_ids[index % len(team_ids)]
+        project_id = f"project{index:05d}"
+        teams[team_id]['projects'].append(project_id)
+        projects[project_id] = {
+            'name': f"Project {index}",
+            'teamId': team_id,
+            'status': statuses[index % len(statuses)],
+            'assignedMembers': rng.sample(user_ids, min(3, len(user_ids))),
+            'createdAt': base_time + index * 60000
+        }
+
+    conversations = {}
+    messages = {}
+    for index in range(6 * scale):
+        conv_id = f"conv{index:05d}"
+        participants = rng.sample(user_ids, min(3, len(user_ids)))
+        conversations[conv_id] = {
+            'name': f"Conversation {index}",
+            'type': 'group' if index % 3 == 0 else 'direct',
+            'participants': participants,
+            'createdAt': base_time + index * 5000
+        }
+        if index % 4 != 3:
+            messages[conv_id] = {
+                f"msg{message:06d}": {
+                    'senderId': participants[message % len(participants)],
+                    'content': f"Message {message} in {conv_id}",
+                    'timestamp': base_time + message * 1000
+                }
+                for message in range(rng.randint(1, 20))
+            }
+
+    errors = {
+        f"error{index:06d}": {
+            'message': f"Error {index}",
+            'level': levels[index % len(levels)],
+            'timestamp': base_time + index * 30000,
+            'userId': rng.choice(user_ids)
+        }
+        for index in range(40 * scale)
+    }
+    performance_metrics = {
+        f"metric{index:06d}": {
+            'name': metric_names[index % len(metric_names)],
+            'value': round(rng.lognormvariate(4, 0.6), 2),
+            'timestamp': base_time + index * 10000
+        }
+        for index in range(100 * scale)
+    }
+    user_metrics = {
+        uid: {
+            'totalSessions': rng.randint(1, 50),
+            'pageViews': rng.randint(10, 500),
+            'errorCount': rng.randint(0, 12),
+            'avgSessionDuration': rng.randint(30000, 1800000)
+        }
+        for uid in user_ids
+    }
+    system_analytics = {
+        'totalUsers': len(users),
+        'activeUsers': sum(1 for user in users.values() if user['isOnline']),
+        'totalSessions': sum(metrics['totalSessions'] for metrics in user_metrics.values()),
+        'totalPageViews': sum(metrics['pageViews'] for metrics in user_metrics.values()),
+        'errorRate': round(len(errors) / max(1, sum(metrics['pageViews'] for metrics in user_metrics.values())), 4)
+    }
+
+    # Each project's tasks form a DAG: a task may only be blocked by earlier tasks of its project
+    tasks = {}
+    task_statuses = ['todo', 'in-progress', 'blocked', 'done']
+    for project_index, project_id in enumerate(sorted(projects)):
+        task_ids = [f"task{project_index * 6 + offset:07d}" for offset in range(6)]
+        for offset, task_id in enumerate(task_ids):
+            tasks[task_id] = {
+                'title': f"Task {offset} of {project_id}",
+                'status': task_statuses[rng.randrange(len(task_statuses))],
+                'projectId': project_id,
+                'assignedTo': rng.choice(projects[project_id]['assignedMembers']),
+                'estimatedHours': rng.randint(1, 16),
+                'blockedBy': sorted(rng.sample(task_ids[:offset], min(offset, rng.randint(0, 2)))),
+                'blocks': [],
+                'subtasks': []
+            }
+        for task_id in task_ids:
+            for blocker in tasks[task_id]['blockedBy']:
+                tasks[blocker]['blocks'].append(task_id)
+        tasks[task_ids[0]]['subtasks'] = [task_ids[5]]
+        tasks[task_ids[5]]['parentTask'] = task_ids[0]
+
+    return {
+        'conversations': conversations,
+        'errors': errors,
+        'featureFlags': {'chat': {'enabled': True}},
+        'messages': messages,
+        'performanceMetrics': performance_metrics,
+        'projects': projects,
+        'systemAnalytics': system_analytics,
+        'tasks': tasks,
+        'teams': teams,
+        'userMetrics': user_metrics,
+        'users': users
+    }
+
+
+def collections_from_report(report_path: str) -> List[str]:
+    """Read the collection names logged by a previous run in test_report.json"""
+    with open(report_path, 'r') as f:
+        report = json.load(f)
+    for entry in report.get('details', {}).get('passed', []):
+        match = re.match(r"Found collections: \[(.*)\]$", entry.get('message', ''))
+        if match:
+            return [name.strip().strip("'\"") for name in match.group(1).split(',') if name.strip()]
+    return []
+
+
+def capture_fixture(database_url: str, output_path: str, collections: Optional[List[str]] = None,
+                    api_key: Optional[str] = None):
+    """Download collections from a live database into a fixture file"""
+    transport = FirebaseRestTransport(database_url, api_key)
+    try:
+        if not collections:
+            response = transport.get('', params={'shallow': 'true'})
+            response.raise_for_status()
+            collections = sorted((response.json() or {}).keys())
+
+        fixture = {}
+        for collection in collections:
+            response = transport.get(collection)
+            response.raise_for_status()
+            data = response.json()
+            if data is not None:
+                fixture[collection] = data
+    finally:
+        transport.close()
+
+    with open(output_path, 'w') as f:
+        json.dump(fixture, f, indent=2, sort_keys=True)
+    return fixture
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Firebase RTDB REST stand-in")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve = subparsers.add_parser("serve", help="serve a JSON fixture over HTTP")
+    serve.add_argument("fixture", help="JSON file used as the database root")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=9000)
+    serve.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    serve.add_argument("--jitter", type=float, default=0.0, help="extra random latency, in seconds")
+    serve.add_argument("--bandwidth", type=int, default=None, help="response bytes per second")
+    serve.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    serve.add_argument("--seed", type=int, default=None, help="seed for jitter and error injection")
+    serve.add_argument("--verbose", action="store_true", help="log every request")
+
+    capture = subparsers.add_parser("capture", help="save a live database as a fixture")
+    capture.add_argument("database_url")
+    capture.add_argument("output")
+    capture.add_argument("--api-key", default=None)
+    capture.add_argument("--from-report", default=None,
+                         help="only capture the collections listed in this test_report.json")
+
+    generate = subparsers.add_parser("generate", help="write a synthetic Devium-shaped fixture")
+    generate.add_argument("output")
+    generate.add_argument("--scale", type=int, default=1, help="multiplier for every collection size")
+    generate.add_argument("--seed", type=int, default=42)
+
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        with open(args.output, 'w') as f:
+            json.dump(build_synthetic_fixture(args.scale, args.seed), f)
+        print(f"🧪 Wrote synthetic fixture (scale {args.scale}) to {args.output}")
+    elif args.command == "capture":
+        names = collections_from_report(args.from_report) if args.from_report else None
+        captured = capture_fixture(args.database_url, args.output, names, args.api_key)
+        print(f"📥 Captured {len(captured)} collections to {args.output}")
+    else:
+        server = LocalFirebaseServer.from_fixture(
+            args.fixture, host=args.host, port=args.port, latency=args.latency, jitter=args.jitter,
+            bandwidth=args.bandwidth, error_rate=args.error_rate, seed=args.seed, verbose=args.verbose
+        )
+        print(f"🔥 Serving {args.fixture} at {server.url}")
+        try:
+            server.start()
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.stop()
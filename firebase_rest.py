@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Shared Firebase REST transport for the Devium test scripts
+Keeps one pooled keep-alive session per tester and retries transient failures
+"""
+
+import json
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from firebase_tracing import TraceHook, NullTraceHook, TraceRecord, current_test
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# A failed POST (push) may still have been applied, so only these are retried by default
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'PATCH', 'DELETE'}
+
+# Seconds spent opening connections (TCP + TLS) by the current thread's request
+_connect_timer = threading.local()
+
+
+def _timed_connect(connect):
+    start = time.perf_counter()
+    try:
+        connect()
+    finally:
+        _connect_timer.seconds = getattr(_connect_timer, 'seconds', 0.0) + time.perf_counter() - start
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        _timed_connect(super().connect)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        _timed_connect(super().connect)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools time connection setup for tracing"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool
+        }
+
+
+class FirebaseRestTransport:
+    """Pooled HTTP session for the Firebase Realtime Database REST API"""
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None, pool_size: int = 10,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_cap: float = 8.0,
+                 timeout: float = 10, trace_hook: Optional[TraceHook] = None):
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = timeout
+        self.retry_count = 0
+        self.trace_hook = trace_hook or NullTraceHook()
+        self._stats_lock = threading.Lock()
+
+        # Retries are handled here so they can use jittered backoff and be counted
+        self._adapter = _TimedHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session = requests.Session()
+        self.session.mount('https://', self._adapter)
+        self.session.mount('http://', self._adapter)
+        self.session.headers.update({
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip',
+            'Connection': 'keep-alive'
+        })
+
+    def url_for(self, path: str) -> str:
+        """Build the REST URL for a database path"""
+        return f"{self.base_url}/{path.strip('/')}.json"
+
+    def request(self, method: str, path: str, params: Optional[Dict[str, Any]] = None,
+                json_body: Any = None, idempotent: Optional[bool] = None, **kwargs) -> requests.Response:
+        """Send a request, retrying 429/5xx and connection errors with backoff
+
+        Only idempotent methods are retried unless the caller passes
+        idempotent=True (e.g. a POST it can safely repeat).
+        """
+        query = dict(params or {})
+        if self.api_key:
+            query.setdefault('key', self.api_key)
+        kwargs.setdefault('timeout', self.timeout)
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        max_retries = self.max_retries if idempotent else 0
+
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            retry_after = None
+            _connect_timer.seconds = 0.0
+            attempt_started = time.perf_counter()
+            try:
+                response = self.session.request(method, self.url_for(path), params=query,
+                                                json=json_body, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= max_retries:
+                    self._trace(method, path, params, None, started, attempt_started, attempt, error=e)
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= max_retries:
+                    self._trace(method, path, params, response, started, attempt_started, attempt,
+                                streamed=kwargs.get('stream', False))
+                    return response
+                retry_after = response.headers.get('Retry-After')
+                response.close()
+
+            time.sleep(self._backoff_delay(attempt, retry_after))
+            attempt += 1
+            with self._stats_lock:
+                self.retry_count += 1
+
+    def _trace(self, method: str, path: str, params: Optional[Dict[str, Any]],
+               response: Optional[requests.Response], started: float, attempt_started: float,
+               retries: int, streamed: bool = False, error: Optional[Exception] = None):
+        """Split the final attempt into connect / TTFB / download and emit a trace record"""
+        if isinstance(self.trace_hook, NullTraceHook):
+            return
+        finished = time.perf_counter()
+        connect = getattr(_connect_timer, 'seconds', 0.0)
+        trace = TraceRecord(
+            method=method,
+            path=path.strip('/'),
+            params={name: value for name, value in (params or {}).items() if name != 'key'},
+            connect_ms=connect * 1000,
+            total_ms=(finished - started) * 1000,
+            retries=retries,
+            test=current_test(),
+            timestamp=datetime.now().isoformat(),
+            error=str(error) if error is not None else None
+        )
+        if response is not None:
+            # elapsed runs from sending the request until the headers were parsed
+            headers_at = response.elapsed.total_seconds()
+            trace.status = response.status_code
+            trace.ttfb_ms = max(0.0, headers_at - connect) * 1000
+            if streamed:
+                # The body is read later by the caller; only its declared size is known here
+                trace.bytes = int(response.headers.get('Content-Length') or 0)
+            else:
+                trace.download_ms = max(0.0, (finished - attempt_started) - headers_at) * 1000
+                wire_bytes = response.raw.tell() if hasattr(response.raw, 'tell') else 0
+                trace.bytes = wire_bytes or len(response.content)
+        self.trace_hook.record(trace)
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> requests.Response:
+        """GET a database path"""
+        return self.request('GET', path, params=params, **kwargs)
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After when present"""
+        if retry_after:
+            try:
+                return min(self.backoff_cap, float(retry_after))
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def connection_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host request and connection counts from the urllib3 pools"""
+        stats = {}
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{pool.scheme}://{pool.host}"
+            if pool.port:
+                host = f"{host}:{pool.port}"
+            requests_made = pool.num_requests
+            opened = pool.num_connections
+            reused = max(0, requests_made - opened)
+            stats[host] = {
+                'requests': requests_made,
+                'connections_opened': opened,
+                'connections_reused': reused,
+                'reuse_rate': (reused / requests_made * 100) if requests_made > 0 else 0
+            }
+        return stats
+
+    def close(self):
+        """Close the session and release pooled connections"""
+        self.session.close()
+        self.trace_hook.close()
+
+
+def split_path(path: str) -> List[str]:
+    """Split a database path into its non-empty segments"""
+    return [segment for segment in path.strip('/').split('/') if segment]
+
+
+def walk_tree(node: Any, segments: List[str]) -> Any:
+    """Follow path segments through a fetched tree, returning None if absent"""
+    for segment in segments:
+        if isinstance(node, dict):
+            node = node.get(segment)
+        elif isinstance(node, list) and segment.isdigit() and int(segment) < len(node):
+            node = node[int(segment)]
+        else:
+            return None
+        if node is None:
+            return None
+    return node
+
+
+def shallow_view(node: Any) -> Any:
+    """Mimic a shallow=true response: nested children collapse to true"""
+    if isinstance(node, dict):
+        return {key: True if isinstance(value, (dict, list)) else value for key, value in node.items()}
+    if isinstance(node, list):
+        return {str(index): True if isinstance(value, (dict, list)) else value
+                for index, value in enumerate(node) if value is not None}
+    return node
+
+
+def key_sort_order(key: str) -> Tuple:
+    """Sort key matching RTDB orderBy="$key": 32-bit integer keys first, then strings"""
+    if key.lstrip('-').isdigit() and -2 ** 31 <= int(key) < 2 ** 31:
+        return (0, int(key), '')
+    return (1, 0, key)
+
+
+def key_page_params(page_size: int, last_key: Optional[str] = None) -> Dict[str, Any]:
+    """Query for the page after last_key (startAt is inclusive, so ask for one extra)"""
+    params = {'orderBy': '"$key"', 'limitToFirst': page_size}
+    if last_key is not None:
+        params['startAt'] = json.dumps(last_key)
+        params['limitToFirst'] = page_size + 1
+    return params
+
+
+def key_page_keys(page: Any, last_key: Optional[str] = None) -> Tuple[Dict[str, Any], List[str]]:
+    """Normalize a fetched page and return it with its new keys in key order"""
+    if isinstance(page, list):
+        page = {str(index): value for index, value in enumerate(page) if value is not None}
+    if not isinstance(page, dict) or not page:
+        return {}, []
+    keys = sorted(page, key=key_sort_order)
+    if last_key is not None and keys[0] == last_key:
+        keys = keys[1:]
+    return page, keys
+
+
+def iter_key_pages(fetch: Callable[[str, Dict], Any], path: str,
+                   page_size: int = 500) -> Iterator[Tuple[str, Any]]:
+    """Stream (key, value) pairs of a collection page by page in key order
+
+    Uses orderBy="$key" with limitToFirst/startAt. startAt is inclusive, so
+    every page after the first asks for one extra record and drops the
+    overlap. The REST API returns each page unsorted, so it is sorted here.
+    """
+    page_size = max(1, page_size)
+    last_key = None
+    while True:
+        params = key_page_params(page_size, last_key)
+        page, keys = key_page_keys(fetch(path, params), last_key)
+        if not page:
+            return
+        for key in keys:
+            yield key, page[key]
+
+        if len(page) < params['limitToFirst'] or not keys:
+            return
+        last_key = keys[-1]
+
+
+class FirebaseSnapshot:
+    """Per-run cache that serves child paths from a single root download"""
+
+    def __init__(self, fetch: Callable[[str], Any]):
+        self._fetch = fetch
+        self._root = None
+        self._loaded = False
+        self._failed = False
+        self._stale = set()
+        self._lock = threading.Lock()
+        self.fetched_at = None
+        self.fetch_count = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self) -> Any:
+        """Download the root once; later calls return the cached tree"""
+        with self._lock:
+            if not self._loaded and not self._failed:
+                self._load_root()
+            return self._root
+
+    def get(self, path: str = "") -> Any:
+        """Return the value at path, refreshing it first if it was invalidated"""
+        root = self.load()
+        if not self._loaded:
+            # Root download failed - fall back to fetching the path directly
+            return self._fetch(path)
+
+        segments = split_path(path)
+        with self._lock:
+            for stale_path in list(self._stale):
+                stale_segments = split_path(stale_path)
+                if segments[:len(stale_segments)] == stale_segments or stale_segments[:len(segments)] == segments:
+                    self._refresh_path(stale_path)
+            root = self._root
+        return walk_tree(root, segments)
+
+    def covers(self, path: str) -> bool:
+        """Every path is served from the root download"""
+        return True
+
+    def invalidate(self, path: str = ""):
+        """Mark a path (or the whole tree) as stale so the next read re-fetches it"""
+        with self._lock:
+            if not split_path(path):
+                self._root = None
+                self._loaded = False
+                self._failed = False
+                self._stale.clear()
+            else:
+                self._stale.add('/'.join(split_path(path)))
+
+    def refresh(self, path: str = "") -> Any:
+        """Re-fetch a path immediately and graft it into the cached tree"""
+        with self._lock:
+            if not split_path(path) or not self._loaded:
+                self._load_root()
+            else:
+                self._refresh_path(path)
+            return walk_tree(self._root, split_path(path))
+
+    def _load_root(self):
+        root = self._fetch("")
+        self.fetch_count += 1
+        self._stale.clear()
+        self._root = root
+        self._loaded = root is not None
+        self._failed = not self._loaded
+        self.fetched_at = datetime.now().isoformat() if self._loaded else None
+
+    def _refresh_path(self, path: str):
+        segments = split_path(path)
+        value = self._fetch('/'.join(segments))
+        self.fetch_count += 1
+        self._stale = {stale for stale in self._stale
+                       if split_path(stale)[:len(segments)] != segments}
+
+        # RTDB arrays come back as lists; key them by index so their siblings survive
+        if isinstance(self._root, list):
+            self._root = {str(index): child for index, child in enumerate(self._root) if child is not None}
+        elif not isinstance(self._root, dict):
+            self._root = {}
+        parent = self._root
+        for segment in segments[:-1]:
+            child = parent.get(segment)
+            if isinstance(child, list):
+                child = {str(index): item for index, item in enumerate(child) if item is not None}
+                parent[segment] = child
+            elif not isinstance(child, dict):
+                child = {}
+                parent[segment] = child
+            parent = child
+        if value is None:
+            parent.pop(segments[-1], None)
+        else:
+            parent[segments[-1]] = value
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Per-request tracing for Firebase REST calls
+Trace records flow through a pluggable hook: no-op by default, with an
+in-memory aggregator for reports and an NDJSON file sink for offline analysis
+"""
+
+import json
+import sys
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+# A context variable rather than a thread-local so labels follow asyncio tasks too
+_test_label = ContextVar('devium_test_label', default=None)
+
+
+@dataclass
+class TraceRecord:
+    """One Firebase REST call, timed from the caller's point of view"""
+    method: str
+    path: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    status: Optional[int] = None
+    connect_ms: float = 0.0
+    ttfb_ms: float = 0.0
+    download_ms: float = 0.0
+    total_ms: float = 0.0
+    bytes: int = 0
+    retries: int = 0
+    test: str = ""
+    timestamp: str = ""
+    error: Optional[str] = None
+
+
+def current_test() -> str:
+    """Name of the test method issuing the current request
+
+    Uses the label set by traced_test() in this thread or task, falling
+    back to the nearest test_* frame on the call stack.
+    """
+    label = _test_label.get()
+    if label:
+        return label
+    frame = sys._getframe(1)
+    while frame is not None:
+        if frame.f_code.co_name.startswith('test_'):
+            return frame.f_code.co_name
+        frame = frame.f_back
+    return ""
+
+
+@contextmanager
+def traced_test(name: str):
+    """Attribute requests made on this thread or task (e.g. a pool worker) to a test"""
+    token = _test_label.set(name)
+    try:
+        yield
+    finally:
+        _test_label.reset(token)
+
+
+class TraceHook:
+    """Receives every trace record; the base class ignores them"""
+
+    def record(self, trace: TraceRecord):
+        pass
+
+    def close(self):
+        pass
+
+
+class NullTraceHook(TraceHook):
+    """Default hook: tracing disabled"""
+
+
+class CompositeTraceHook(TraceHook):
+    """Fan records out to several hooks"""
+
+    def __init__(self, hooks: List[TraceHook]):
+        self.hooks = list(hooks)
+
+    def record(self, trace: TraceRecord):
+        for hook in self.hooks:
+            hook.record(trace)
+
+    def close(self):
+        for hook in self.hooks:
+            hook.close()
+
+
+class InMemoryTraceAggregator(TraceHook):
+    """Per-path totals, kept as aggregates so memory does not grow with requests"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.paths = {}
+        self.total_requests = 0
+        self.total_bytes = 0
+
+    def record(self, trace: TraceRecord):
+        with self._lock:
+            self.total_requests += 1
+            self.total_bytes += trace.bytes
+            stats = self.paths.get(trace.path)
+            if stats is None:
+                stats = self.paths[trace.path] = {
+                    'path': trace.path or '/',
+                    'requests': 0,
+                    'errors': 0,
+                    'retries': 0,
+                    'total_ms': 0.0,
+                    'max_ms': 0.0,
+                    'connect_ms': 0.0,
+                    'ttfb_ms': 0.0,
+                    'download_ms': 0.0,
+                    'bytes': 0,
+                    'max_bytes': 0,
+                    'tests': set()
+                }
+            stats['requests'] += 1
+            stats['retries'] += trace.retries
+            stats['total_ms'] += trace.total_ms
+            stats['max_ms'] = max(stats['max_ms'], trace.total_ms)
+            stats['connect_ms'] += trace.connect_ms
+            stats['ttfb_ms'] += trace.ttfb_ms
+            stats['download_ms'] += trace.download_ms
+            stats['bytes'] += trace.bytes
+            stats['max_bytes'] = max(stats['max_bytes'], trace.bytes)
+            if trace.error is not None or (trace.status is not None and trace.status >= 400):
+                stats['errors'] += 1
+            if trace.test:
+                stats['tests'].add(trace.test)
+
+    def _top(self, sort_field: str, limit: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            ranked = sorted(self.paths.values(), key=lambda stats: stats[sort_field], reverse=True)[:limit]
+            return [
+                dict(stats,
+                     avg_ms=round(stats['total_ms'] / stats['requests'], 2),
+                     total_ms=round(stats['total_ms'], 2),
+                     max_ms=round(stats['max_ms'], 2),
+                     connect_ms=round(stats['connect_ms'], 2),
+                     ttfb_ms=round(stats['ttfb_ms'], 2),
+                     download_ms=round(stats['download_ms'], 2),
+                     tests=sorted(stats['tests']))
+                for stats in ranked
+            ]
+
+    def slowest_paths(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Paths ranked by total time spent on them"""
+        return self._top('total_ms', limit)
+
+    def heaviest_payloads(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Paths ranked by total response bytes"""
+        return self._top('bytes', limit)
+
+
+class NDJSONTraceSink(TraceHook):
+    """Append each record as one JSON line"""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        self._file = open(file_path, 'a')
+
+    def record(self, trace: TraceRecord):
+        line = json.dumps(asdict(trace), separators=(',', ':'))
+        with self._lock:
+            self._file.write(line + '\n')
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Live Firebase subscriptions over the RTDB REST event stream
+Each watched collection is one text/event-stream request; put and patch
+events are applied to an in-memory tree that readers can query like a
+snapshot, and changed collections are queued for re-evaluation
+"""
+
+import codecs
+import json
+import queue
+import random
+import socket
+import threading
+import time
+from datetime import datetime
+from typing import Any, Iterable, Iterator, List, Optional, Set, Tuple
+
+from firebase_rest import FirebaseRestTransport, split_path, walk_tree
+
+
+def iter_sse(chunks: Iterable[bytes]) -> Iterator[Tuple[str, str]]:
+    """Parse a text/event-stream body into (event, data) pairs"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    event = None
+    data_lines = []
+    for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        while True:
+            newline = buffer.find('\n')
+            if newline < 0:
+                break
+            line = buffer[:newline].rstrip('\r')
+            buffer = buffer[newline + 1:]
+            if not line:
+                if event is not None or data_lines:
+                    yield event or 'message', '\n'.join(data_lines)
+                event = None
+                data_lines = []
+            elif not line.startswith(':'):
+                field, _, value = line.partition(':')
+                if value.startswith(' '):
+                    value = value[1:]
+                if field == 'event':
+                    event = value
+                elif field == 'data':
+                    data_lines.append(value)
+
+
+def _iter_raw_chunks(raw: Any, chunk_size: int = 65536) -> Iterator[bytes]:
+    """Yield bytes as soon as they arrive instead of waiting for a full buffer"""
+    read1 = getattr(raw, 'read1', None)
+    while True:
+        chunk = read1(chunk_size) if read1 is not None else raw.read(1)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _shutdown_stream(response: Any):
+    """Unblock a reader waiting in raw.read1() on another thread, then close the response
+
+    Closing alone waits in http.client until the server's next keep-alive;
+    shutting the socket down makes the blocked read return at once.
+    """
+    raw = response.raw
+    connection = getattr(raw, '_connection', None)
+    sock = getattr(connection, 'sock', None)
+    if sock is None:
+        # Older urllib3 keeps the connection only inside http.client's socket file
+        fp = getattr(getattr(raw, '_fp', None), 'fp', None)
+        sock = getattr(getattr(fp, 'raw', None), '_sock', None)
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+    response.close()
+
+
+def assoc_path(node: Any, segments: List[str], value: Any) -> Any:
+    """Copy of node with value set at segments (None deletes); untouched subtrees are shared
+
+    Readers holding the previous tree keep a consistent view, so the
+    tree never needs locking or deep copies while suites iterate it.
+    """
+    if not segments:
+        return value
+    key, rest = segments[0], segments[1:]
+    if isinstance(node, list) and key.isdigit() and int(key) < len(node):
+        updated = list(node)
+        updated[int(key)] = assoc_path(node[int(key)], rest, value)
+        return updated
+    if isinstance(node, list):
+        node = {str(index): child for index, child in enumerate(node) if child is not None}
+    updated = dict(node) if isinstance(node, dict) else {}
+    child = assoc_path(updated.get(key), rest, value)
+    if child is None or child == {}:
+        # RTDB drops empty objects and deleted children
+        updated.pop(key, None)
+    else:
+        updated[key] = child
+    return updated
+
+
+class WatchedTree:
+    """Collections kept current by event streams, readable like FirebaseSnapshot
+
+    covers() tells callers which paths are served from memory; anything
+    else should still be fetched over the network.
+    """
+
+    def __init__(self, transport: FirebaseRestTransport, collections: List[str],
+                 read_timeout: float = 90.0, max_backoff: float = 30.0):
+        self.transport = transport
+        self.collections = list(collections)
+        self.read_timeout = read_timeout
+        self.max_backoff = max_backoff
+        self._root = {}
+        self._write_lock = threading.Lock()
+        self._ready = {collection: threading.Event() for collection in self.collections}
+        self._changes = queue.Queue()
+        self._stop = threading.Event()
+        self._responses = {}
+        self._threads = []
+        self.loaded = False
+        self.fetched_at = None
+        self.fetch_count = 0
+        self.event_count = 0
+        self.reconnects = 0
+
+    def start(self) -> 'WatchedTree':
+        for collection in self.collections:
+            thread = threading.Thread(target=self._subscribe, args=(collection,), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until every collection has received its initial put"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for event in self._ready.values():
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not event.wait(remaining):
+                return False
+        self.loaded = True
+        self.fetched_at = datetime.now().isoformat()
+        return True
+
+    def stop(self):
+        self._stop.set()
+        for response in list(self._responses.values()):
+            _shutdown_stream(response)
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+
+    def covers(self, path: str) -> bool:
+        segments = split_path(path)
+        return bool(segments) and segments[0] in self._ready
+
+    def load(self) -> Any:
+        return self._root
+
+    def get(self, path: str = "") -> Any:
+        return walk_tree(self._root, split_path(path))
+
+    def invalidate(self, path: str = ""):
+        """Nothing to do: the streams keep the tree current"""
+
+    def changes(self, timeout: Optional[float] = None, debounce: float = 0.5) -> Set[str]:
+        """Collections changed since the last call, waiting up to timeout for the first one
+
+        Events arriving within `debounce` seconds of each other are
+        batched so a burst of writes triggers a single re-evaluation.
+        """
+        changed = set()
+        try:
+            changed.add(self._changes.get(timeout=timeout))
+        except queue.Empty:
+            return changed
+        while True:
+            try:
+                changed.add(self._changes.get(timeout=debounce))
+            except queue.Empty:
+                return changed
+
+    def _apply(self, collection: str, event: str, payload: Any):
+        segments = [collection] + split_path(payload.get('path', '/'))
+        data = payload.get('data')
+        with self._write_lock:
+            if event == 'put':
+                self._root = assoc_path(self._root, segments, data)
+            elif isinstance(data, dict):
+                root = self._root
+                for relative_path, value in data.items():
+                    root = assoc_path(root, segments + split_path(relative_path), value)
+                self._root = root
+            self.event_count += 1
+
+    def _subscribe(self, collection: str):
+        """Keep one event stream open, reconnecting with jittered backoff"""
+        attempt = 0
+        while not self._stop.is_set():
+            try:
+                response = self.transport.get(collection, headers={'Accept': 'text/event-stream'}, stream=True,
+                                              timeout=(self.transport.timeout, self.read_timeout))
+                if response.status_code != 200:
+                    response.close()
+                    raise ConnectionError(f"event stream for {collection} returned {response.status_code}")
+                self._responses[collection] = response
+                self.fetch_count += 1
+                response.raw.decode_content = True
+
+                for event, data in iter_sse(_iter_raw_chunks(response.raw)):
+                    if event in ('put', 'patch'):
+                        self._apply(collection, event, json.loads(data) or {})
+                        attempt = 0
+                        if self._ready[collection].is_set():
+                            self._changes.put(collection)
+                        else:
+                            self._ready[collection].set()
+                    elif event == 'cancel':
+                        # Access to the location was revoked; retrying will not help
+                        self._ready[collection].set()
+                        return
+                    # keep-alive needs no handling; auth_revoked ends the stream and reconnects
+                    if self._stop.is_set() or event == 'auth_revoked':
+                        break
+            except Exception:
+                if self._stop.is_set():
+                    return
+            finally:
+                stale = self._responses.pop(collection, None)
+                if stale is not None:
+                    stale.close()
+
+            if self._stop.is_set():
+                return
+            self.reconnects += 1
+            delay = random.uniform(0, min(self.max_backoff, 0.5 * (2 ** attempt)))
+            attempt += 1
+            self._stop.wait(delay)
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Fleet Runner for Devium deployments
+Shards a list of tenant databases across a process pool, one tester per
+tenant in its own process with its own transport, caches and report
+files, then merges the per-tenant reports into one fleet summary. The
+fleet takes about as long as its slowest tenant.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from firebase_local_server import LocalFirebaseServer
+from test_project_simple import DeviumProjectTester
+
+# Tenant keys passed straight to the tester's constructor
+TESTER_OPTIONS = {'max_workers', 'pool_size', 'max_retries', 'use_snapshot', 'count_only', 'page_size',
+                  'stream', 'summary_only', 'suite_workers', 'cache_max_bytes'}
+
+
+def tenant_name(database_url: str) -> str:
+    """Default tenant name: the database host without the RTDB suffix (host:port/path for IPs)"""
+    parsed = urlparse(database_url)
+    hostname = parsed.hostname or ''
+    if not hostname or hostname.replace('.', '').isdigit():
+        return f"{parsed.netloc}{parsed.path}".strip('/') or database_url
+    return hostname.split('.')[0]
+
+
+def read_fleet(path: str) -> List[Any]:
+    """Tenant entries from a JSON list (or {"tenants": [...]}) or a text file of URLs, one per line"""
+    with open(path, 'r') as f:
+        text = f.read()
+    if path.endswith('.json'):
+        entries = json.loads(text)
+        return entries.get('tenants', []) if isinstance(entries, dict) else entries
+    return [line.strip() for line in text.splitlines() if line.strip() and not line.strip().startswith('#')]
+
+
+def normalize_tenants(entries: List[Any]) -> List[Dict[str, Any]]:
+    """Tenant configs with unique, path-safe names
+
+    An entry is a database URL or a config object with 'database_url' (or
+    'databaseURL') or 'local', a fixture served by an in-process local
+    database; a config may also set 'name', 'api_key' and tester options.
+    """
+    tenants = []
+    names = set()
+    for index, entry in enumerate(entries):
+        tenant = {'database_url': entry} if isinstance(entry, str) else dict(entry)
+        if 'databaseURL' in tenant:
+            tenant['database_url'] = tenant.pop('databaseURL')
+        if not tenant.get('database_url') and not tenant.get('local'):
+            raise ValueError(f"Tenant {index} has no database_url or local fixture")
+        name = tenant.get('name') or (tenant_name(tenant['database_url']) if tenant.get('database_url')
+                                      else os.path.splitext(os.path.basename(tenant['local']))[0])
+        # Names become directory names, so keep them unique and path-safe
+        name = re.sub(r'[^A-Za-z0-9_.-]', '_', name)
+        base, suffix = name, 2
+        while name in names:
+            name = f"{base}-{suffix}"
+            suffix += 1
+        names.add(name)
+        tenant['name'] = name
+        tenants.append(tenant)
+    return tenants
+
+
+def run_tenant(tenant: Dict[str, Any], output_dir: str, use_async: bool = False,
+               max_in_flight: int = 100) -> Dict[str, Any]:
+    """Test one tenant in this process; console output goes to <output_dir>/<name>/console.log"""
+    tenant_dir = os.path.join(output_dir, tenant['name'])
+    os.makedirs(tenant_dir, exist_ok=True)
+    result = {'name': tenant['name'], 'database_url': tenant.get('database_url'), 'pid': os.getpid()}
+
+    start = time.perf_counter()
+    server = None
+    try:
+        with open(os.path.join(tenant_dir, 'console.log'), 'w') as log, contextlib.redirect_stdout(log):
+            database_url = tenant.get('database_url')
+            if tenant.get('local'):
+                server = LocalFirebaseServer.from_fixture(tenant['local']).start()
+                database_url = server.url
+
+            # Caches and reports live under the tenant's directory, so tenants never share state
+            options = {key: value for key, value in tenant.items() if key in TESTER_OPTIONS}
+            tester_class = DeviumProjectTester
+            if use_async:
+                from test_project_async import AsyncDeviumProjectTester
+                tester_class = AsyncDeviumProjectTester
+                options['max_in_flight'] = max_in_flight
+                options.pop('use_snapshot', None)
+                options.pop('stream', None)
+            else:
+                options['cache_dir'] = os.path.join(tenant_dir, 'cache')
+            tester = tester_class(database_url=database_url, api_key=tenant.get('api_key'),
+                                  report_path=os.path.join(tenant_dir, 'test_report.ndjson'),
+                                  json_report=False, **options)
+            report = tester.run_all_tests()
+
+        with open(os.path.join(tenant_dir, 'test_report.json'), 'w') as f:
+            json.dump(report, f, indent=2)
+        result['summary'] = report['summary']
+        result['failures'] = report['details'].get('failed', [])
+        result['warnings'] = report['details'].get('warnings', [])
+        result['suite_wall_ms'] = report['suites']['timings_ms'].get('wall')
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {str(e)}"
+    finally:
+        if server is not None:
+            server.stop()
+    result['elapsed_s'] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def merge_reports(results: List[Dict[str, Any]], wall_seconds: float) -> Dict[str, Any]:
+    """Fleet totals, per-tenant rows, and failures shared by several tenants"""
+    totals = {'total': 0, 'passed': 0, 'failed': 0, 'warnings': 0}
+    shared = {}
+    for result in results:
+        for key in totals:
+            totals[key] += result.get('summary', {}).get(key, 0)
+        for failure in result.get('failures', []):
+            shared.setdefault((failure.get('test'), failure.get('message')), []).append(result['name'])
+    totals['success_rate'] = (totals['passed'] / totals['total'] * 100) if totals['total'] else 0
+
+    elapsed = [result['elapsed_s'] for result in results]
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'tenants': len(results),
+        'errored': [result['name'] for result in results if 'error' in result],
+        'summary': totals,
+        'timing': {
+            'wall_s': round(wall_seconds, 3),
+            'slowest_tenant_s': max(elapsed) if elapsed else 0,
+            'sum_of_tenants_s': round(sum(elapsed), 3)
+        },
+        'common_failures': [{'test': test, 'message': message, 'tenants': names}
+                            for (test, message), names in sorted(shared.items(), key=lambda item: -len(item[1]))
+                            if len(names) > 1],
+        'per_tenant': {result['name']: result for result in results}
+    }
+
+
+def run_fleet(tenants: List[Dict[str, Any]], output_dir: str, processes: Optional[int] = None,
+              use_async: bool = False, max_in_flight: int = 100) -> Dict[str, Any]:
+    """Run every tenant in a process pool (one process per tenant unless `processes` caps it)"""
+    os.makedirs(output_dir, exist_ok=True)
+    # Tenants mostly wait on the network, so they are not limited to one per CPU
+    workers = max(1, min(processes or len(tenants), len(tenants)))
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_tenant, tenant, output_dir, use_async, max_in_flight): tenant
+                   for tenant in tenants}
+        for future in as_completed(futures):
+            tenant = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker process itself died
+                result = {'name': tenant['name'], 'database_url': tenant.get('database_url'),
+                          'error': f"{type(e).__name__}: {str(e)}", 'elapsed_s': 0}
+            results.append(result)
+            print_tenant(result)
+    order = {tenant['name']: index for index, tenant in enumerate(tenants)}
+    results.sort(key=lambda result: order[result['name']])
+    return merge_reports(results, time.perf_counter() - start)
+
+
+def print_tenant(result: Dict[str, Any]):
+    if 'error' in result:
+        print(f"❌ {result['name']}: did not complete ({result['error']})")
+        return
+    summary = result['summary']
+    status = "✅" if summary['failed'] == 0 else "❌"
+    print(f"{status} {result['name']}: {summary['passed']}/{summary['total']} passed, {summary['failed']} failed, "
+          f"{summary['warnings']} warnings in {result['elapsed_s']:.1f}s")
+
+
+def print_fleet(fleet: Dict[str, Any], output_dir: str):
+    summary = fleet['summary']
+    timing = fleet['timing']
+    print("\n" + "=" * 60)
+    print("📊 FLEET REPORT")
+    print("=" * 60)
+    print(f"Tenants: {fleet['tenants']} ({len(fleet['errored'])} did not complete)")
+    print(f"Total Tests: {summary['total']}")
+    print(f"✅ Passed: {summary['passed']}")
+    print(f"❌ Failed: {summary['failed']}")
+    print(f"⚠️ Warnings: {summary['warnings']}")
+    print(f"\n⏱️ {timing['wall_s']:.1f}s wall, slowest tenant {timing['slowest_tenant_s']:.1f}s, "
+          f"{timing['sum_of_tenants_s']:.1f}s if run one after another")
+
+    if fleet['common_failures']:
+        print("\n❌ FAILING ON SEVERAL TENANTS:")
+        for failure in fleet['common_failures'][:10]:
+            print(f"  - [{failure['test']}] {failure['message']} ({len(failure['tenants'])} tenants)")
+    print(f"\n📄 Fleet report saved to: {os.path.join(output_dir, 'fleet_report.json')}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test several Devium deployments in parallel")
+    parser.add_argument("fleet", nargs="?", default=None,
+                        help="JSON list of tenants (URLs or config objects) or a text file of database URLs")
+    parser.add_argument("--database-url", action="append", default=[],
+                        help="add a tenant by URL (repeatable)")
+    parser.add_argument("--local", action="append", default=[], metavar="FIXTURE",
+                        help="add a tenant served from this fixture by an in-process local RTDB (repeatable)")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="worker processes (default: one per tenant)")
+    parser.add_argument("--output-dir", default="fleet_reports",
+                        help="per-tenant reports, logs and caches go to <output-dir>/<tenant>/")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="run each tenant on an asyncio event loop (requires aiohttp)")
+    parser.add_argument("--max-in-flight", type=int, default=100,
+                        help="concurrent requests per tenant with --async")
+    args = parser.parse_args()
+
+    entries = read_fleet(args.fleet) if args.fleet else []
+    entries += args.database_url + [{'local': fixture} for fixture in args.local]
+    if not entries:
+        parser.error("no tenants: pass a fleet file, --database-url or --local")
+    tenants = normalize_tenants(entries)
+
+    print("🚀 DEVIUM FLEET TEST")
+    print("=" * 60)
+    print(f"Tenants: {len(tenants)}")
+    print(f"Started at: {datetime.now().isoformat()}")
+    print("=" * 60)
+
+    fleet = run_fleet(tenants, args.output_dir, args.processes, args.use_async, args.max_in_flight)
+    with open(os.path.join(args.output_dir, 'fleet_report.json'), 'w') as f:
+        json.dump(fleet, f, indent=2)
+    print_fleet(fleet, args.output_dir)
+    if fleet['errored']:
+        raise SystemExit(1)
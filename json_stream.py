@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Incremental JSON object reader for large Firebase and lockfile payloads
+Yields the members of one JSON object as bytes arrive, so memory is bounded
+by the largest single member instead of the whole document
+"""
+
+import codecs
+import json
+from typing import Any, BinaryIO, Iterator, Sequence, Tuple
+
+_WHITESPACE = ' \t\n\r'
+_NUMBER_CHARS = '0123456789.eE+-'
+_decoder = json.JSONDecoder()
+
+
+def _may_continue(value: Any, next_char: str) -> bool:
+    """True if a decoded number could still be extended by unread input"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return False
+    return next_char == '' or next_char in _NUMBER_CHARS
+
+
+class _StreamBuffer:
+    """Text buffer over a binary stream that grows on demand"""
+
+    def __init__(self, stream: BinaryIO, chunk_size: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.text = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, min_chars: int = 1) -> bool:
+        """Read until at least min_chars are buffered past pos; False at EOF"""
+        while len(self.text) - self.pos < min_chars and not self.eof:
+            chunk = self.stream.read(max(self.chunk_size, min_chars))
+            if not chunk:
+                self.eof = True
+                self.text += self.decoder.decode(b'', final=True)
+            else:
+                self.text += self.decoder.decode(chunk)
+        return len(self.text) - self.pos >= min_chars
+
+    def compact(self):
+        """Drop already-consumed text so finished members can be freed"""
+        if self.pos:
+            self.text = self.text[self.pos:]
+            self.pos = 0
+
+    def next_char(self) -> str:
+        """Skip whitespace and return (without consuming) the next character"""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char: str):
+        found = self.next_char()
+        if found != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos}, found {found!r}")
+        self.pos += 1
+
+    def decode_value(self) -> Any:
+        """Decode one complete JSON value starting at pos"""
+        self.next_char()
+        self.compact()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                # A number cut off by the buffer edge may continue in the next chunk
+                if self.eof or not _may_continue(value, self.text[end:end + 1]):
+                    self.pos = end
+                    return value
+            # Double the buffer before retrying so large values stay linear
+            self.fill(len(self.text) - self.pos + max(self.chunk_size, len(self.text)))
+
+
+def _iter_members(buffer: _StreamBuffer, prefix: Sequence[str]) -> Iterator[Tuple[str, Any]]:
+    first = buffer.next_char()
+    if first != '{':
+        # Not an object here (array, scalar or null): decode it whole
+        value = buffer.decode_value()
+        if not prefix:
+            if isinstance(value, dict):
+                yield from value.items()
+            elif isinstance(value, list):
+                for index, item in enumerate(value):
+                    if item is not None:
+                        yield str(index), item
+        return
+
+    buffer.pos += 1
+    if buffer.next_char() == '}':
+        buffer.pos += 1
+        return
+
+    while True:
+        key = buffer.decode_value()
+        buffer.expect(':')
+        if prefix and key == prefix[0]:
+            yield from _iter_members(buffer, prefix[1:])
+        else:
+            value = buffer.decode_value()
+            if not prefix:
+                yield key, value
+        separator = buffer.next_char()
+        buffer.pos += 1
+        if separator == '}':
+            return
+        if separator != ',':
+            raise ValueError(f"Expected ',' or '}}' at offset {buffer.pos - 1}, found {separator!r}")
+
+
+def iter_object_items(stream: BinaryIO, prefix: Sequence[str] = (),
+                      chunk_size: int = 64 * 1024) -> Iterator[Tuple[str, Any]]:
+    """Yield (key, value) for each member of the JSON object at prefix
+
+    prefix is a sequence of keys leading to a nested object, e.g.
+    ('packages',) for package-lock.json. Siblings outside the prefix are
+    decoded one at a time and discarded. A top-level array is yielded with
+    string indices, matching how Firebase exposes array-like collections.
+    """
+    buffer = _StreamBuffer(stream, chunk_size)
+    yield from _iter_members(buffer, list(prefix))
+
+
+def _iter_at_depth(buffer: _StreamBuffer, depth: int, path: Tuple[str, ...]) -> Iterator[Tuple[Tuple[str, ...], Any]]:
+    if buffer.next_char() != '{':
+        # Arrays and scalars above the requested depth are yielded whole
+        value = buffer.decode_value()
+        if value is not None and path:
+            yield path, value
+        return
+
+    buffer.pos += 1
+    if buffer.next_char() == '}':
+        buffer.pos += 1
+        return
+
+    while True:
+        key = buffer.decode_value()
+        buffer.expect(':')
+        if depth > 1:
+            yield from _iter_at_depth(buffer, depth - 1, path + (key,))
+        else:
+            value = buffer.decode_value()
+            if value is not None:
+                yield path + (key,), value
+        separator = buffer.next_char()
+        buffer.pos += 1
+        if separator == '}':
+            return
+        if separator != ',':
+            raise ValueError(f"Expected ',' or '}}' at offset {buffer.pos - 1}, found {separator!r}")
+
+
+def iter_items_at_depth(stream: BinaryIO, depth: int = 2,
+                        chunk_size: int = 64 * 1024) -> Iterator[Tuple[Tuple[str, ...], Any]]:
+    """Yield (key path, value) for every member `depth` levels below the root object
+
+    With depth=2 a Firebase export yields (('users', uid), record) one
+    record at a time, so no whole collection is ever held in memory.
+    """
+    buffer = _StreamBuffer(stream, chunk_size)
+    yield from _iter_at_depth(buffer, max(1, depth), ())
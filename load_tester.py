@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Load Generator for the Devium chat write path
+Virtual users create conversations, send messages and toggle presence
+through the REST API exactly like firebaseChatService.ts. Operations are
+issued on an open-loop schedule, so a slow database shows up as growing
+latency instead of a quietly reduced request rate
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from firebase_local_server import LocalFirebaseServer, build_synthetic_fixture
+from firebase_rest import FirebaseRestTransport
+from latency_stats import summarize
+
+# Default operation mix, roughly what an active chat client does
+DEFAULT_MIX = {
+    'send_message': 0.8,
+    'toggle_presence': 0.15,
+    'create_conversation': 0.05
+}
+
+
+class OperationResult:
+    __slots__ = ('operation', 'scheduled', 'started', 'finished', 'requests', 'error')
+
+    def __init__(self, operation: str, scheduled: float):
+        self.operation = operation
+        self.scheduled = scheduled
+        self.started = 0.0
+        self.finished = 0.0
+        self.requests = 0
+        self.error = None
+
+    @property
+    def latency(self) -> float:
+        """Time from the scheduled start, so queueing behind slow requests is counted"""
+        return self.finished - self.scheduled
+
+    @property
+    def service_time(self) -> float:
+        return self.finished - self.started
+
+
+class ChatLoadGenerator:
+    """Open-loop load on conversations/, messages/ and users/
+
+    Every node written lives under ids starting with `prefix`, so a run
+    never touches real users' presence and cleanup() can remove it all.
+    """
+
+    def __init__(self, transport: FirebaseRestTransport, virtual_users: int = 20, rate: float = 50.0,
+                 duration: float = 10.0, max_in_flight: int = 32, mix: Optional[Dict[str, float]] = None,
+                 arrivals: str = 'poisson', message_bytes: int = 120, prefix: str = 'loadtest',
+                 seed: Optional[int] = None, setup_retries: int = 5):
+        if arrivals not in ('poisson', 'constant'):
+            raise ValueError(f"Unknown arrival process: {arrivals}")
+        self.transport = transport
+        self.virtual_users = max(1, virtual_users)
+        self.rate = rate
+        self.duration = duration
+        self.max_in_flight = max(1, max_in_flight)
+        self.mix = dict(mix or DEFAULT_MIX)
+        self.arrivals = arrivals
+        self.message_bytes = max(1, message_bytes)
+        self.prefix = prefix
+        # Setup is not measured, so it retries on its own budget whatever the transport's retries are
+        self.setup_retries = max(0, setup_retries)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.user_ids = [f"{prefix}_user{index:05d}" for index in range(self.virtual_users)]
+        self.conversation_ids = []
+        self.results = []
+        self.late_dispatches = 0
+        self.elapsed = 0.0
+        self._conversation_count = 0
+
+    def _check(self, response, result: OperationResult):
+        result.requests += 1
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+
+    def _new_conversation_id(self) -> str:
+        with self._lock:
+            self._conversation_count += 1
+            return f"{self.prefix}_conv{self._conversation_count:06d}"
+
+    def create_conversation(self, result: OperationResult, participants: List[str]):
+        """createConversation: one PATCH of the full record"""
+        conversation_id = self._new_conversation_id()
+        timestamp = int(time.time() * 1000)
+        conversation = {
+            'id': conversation_id,
+            'name': f"Load test {conversation_id}",
+            'type': 'group' if len(participants) > 2 else 'direct',
+            'participants': participants,
+            'createdAt': timestamp,
+            'updatedAt': timestamp
+        }
+        self._check(self.transport.request('PATCH', f'conversations/{conversation_id}', json_body=conversation),
+                    result)
+        with self._lock:
+            self.conversation_ids.append(conversation_id)
+
+    def send_message(self, result: OperationResult, sender: str, conversation_id: str, content: str):
+        """sendMessage: push the message, then update the conversation's lastMessage"""
+        message = {
+            'conversationId': conversation_id,
+            'senderId': sender,
+            'content': content,
+            'type': 'text',
+            'timestamp': int(time.time() * 1000)
+        }
+        response = self.transport.request('POST', f'messages/{conversation_id}', json_body=message)
+        self._check(response, result)
+        message['id'] = response.json()['name']
+        self._check(self.transport.request('PATCH', f'conversations/{conversation_id}',
+                                           json_body={'lastMessage': message, 'updatedAt': message['timestamp']}),
+                    result)
+
+    def toggle_presence(self, result: OperationResult, user_id: str, is_online: bool):
+        """updateUserOnlineStatus: PATCH isOnline and lastSeen"""
+        self._check(self.transport.request('PATCH', f'users/{user_id}',
+                                           json_body={'isOnline': is_online, 'lastSeen': int(time.time() * 1000)}),
+                    result)
+
+    def _retry_setup(self, operation: Callable[[OperationResult], None]):
+        """Run a setup operation, retrying failures with jittered backoff up to setup_retries times"""
+        for attempt in range(self.setup_retries + 1):
+            try:
+                return operation(OperationResult('setup', 0.0))
+            except (RuntimeError, requests.RequestException):
+                if attempt == self.setup_retries:
+                    raise
+                time.sleep(random.uniform(0, min(2.0, 0.1 * (2 ** attempt))))
+
+    def setup(self):
+        """Create the virtual users and a first set of conversations (not timed)"""
+        def create_user(result, user_id):
+            self._check(self.transport.request('PATCH', f'users/{user_id}', json_body={
+                'name': user_id, 'email': f"{user_id}@loadtest.devium.dev", 'role': 'tester', 'isOnline': False
+            }), result)
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            list(executor.map(lambda user_id: self._retry_setup(lambda result: create_user(result, user_id)),
+                              self.user_ids))
+            participants = [self._pick_participants() for _ in range(max(1, self.virtual_users // 3))]
+            list(executor.map(lambda members: self._retry_setup(
+                lambda result: self.create_conversation(result, members)), participants))
+
+        if not self.conversation_ids and self.mix.get('send_message', 0) > 0:
+            raise RuntimeError("Setup created no conversations, so send_message has nothing to post to")
+
+    def _pick_participants(self) -> List[str]:
+        return self._random.sample(self.user_ids, min(self._random.choice([2, 3, 4]), len(self.user_ids)))
+
+    def _plan(self) -> Tuple[str, Tuple]:
+        """Choose the next operation and its arguments (dispatcher thread only, so seeded runs repeat)"""
+        operation = self._random.choices(list(self.mix), weights=list(self.mix.values()))[0]
+        if operation == 'create_conversation':
+            return operation, (self._pick_participants(),)
+        if operation == 'toggle_presence':
+            return operation, (self._random.choice(self.user_ids), self._random.random() < 0.5)
+        with self._lock:
+            conversation_id = self._random.choice(self.conversation_ids)
+        content = ''.join(self._random.choice('abcdefghijklmnopqrstuvwxyz ') for _ in range(self.message_bytes))
+        return operation, (self._random.choice(self.user_ids), conversation_id, content)
+
+    def _execute(self, result: OperationResult, arguments: Tuple):
+        result.started = time.perf_counter()
+        try:
+            getattr(self, result.operation)(result, *arguments)
+        except Exception as e:
+            result.error = str(e) or type(e).__name__
+        result.finished = time.perf_counter()
+
+    def _interarrival(self) -> float:
+        if self.arrivals == 'constant':
+            return 1.0 / self.rate
+        return self._random.expovariate(self.rate)
+
+    def run(self) -> List[OperationResult]:
+        """Dispatch operations at the target rate for `duration` seconds, then drain"""
+        start = time.perf_counter()
+        scheduled = start
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            while True:
+                scheduled += self._interarrival()
+                if scheduled - start >= self.duration:
+                    break
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                elif delay < -0.005:
+                    # The dispatcher itself fell behind the schedule
+                    self.late_dispatches += 1
+                operation, arguments = self._plan()
+                result = OperationResult(operation, scheduled)
+                self.results.append(result)
+                executor.submit(self._execute, result, arguments)
+        self.elapsed = time.perf_counter() - start
+        return self.results
+
+    def cleanup(self):
+        """Delete every node the run created"""
+        paths = ([f'users/{user_id}' for user_id in self.user_ids] +
+                 [f'conversations/{conversation_id}' for conversation_id in self.conversation_ids] +
+                 [f'messages/{conversation_id}' for conversation_id in self.conversation_ids])
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            list(executor.map(lambda path: self.transport.request('DELETE', path), paths))
+
+    def summary(self) -> Dict[str, Any]:
+        """Throughput, latency percentiles and error rates, overall and per operation"""
+        def describe(results: List[OperationResult]) -> Dict[str, Any]:
+            errors = [result for result in results if result.error]
+            succeeded = [result for result in results if not result.error]
+            requests = sum(result.requests for result in results)
+            return {
+                'operations': len(results),
+                'errors': len(errors),
+                'error_rate': round(len(errors) / len(results) * 100, 2) if results else 0,
+                'throughput_ops': round(len(succeeded) / self.elapsed, 2) if self.elapsed else 0,
+                'requests': requests,
+                'latency_ms': summarize([result.latency * 1000 for result in succeeded]),
+                'service_ms': summarize([result.service_time * 1000 for result in succeeded])
+            }
+
+        by_operation = {}
+        for result in self.results:
+            by_operation.setdefault(result.operation, []).append(result)
+        error_messages = {}
+        for result in self.results:
+            if result.error:
+                error_messages[result.error] = error_messages.get(result.error, 0) + 1
+
+        return dict(describe(self.results),
+                    offered_rate=self.rate,
+                    duration_s=self.duration,
+                    elapsed_s=round(self.elapsed, 3),
+                    late_dispatches=self.late_dispatches,
+                    error_messages=error_messages,
+                    by_operation={operation: describe(results) for operation, results in sorted(by_operation.items())})
+
+
+def print_summary(summary: Dict[str, Any]):
+    print(f"{'Operation':<22} {'ops':>7} {'ops/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>8}")
+    print("-" * 78)
+    rows = list(summary['by_operation'].items()) + [('total', summary)]
+    for operation, stats in rows:
+        latency = stats['latency_ms']
+        print(f"{operation:<22} {stats['operations']:>7} {stats['throughput_ops']:>8.1f} {latency['p50']:>9.1f} "
+              f"{latency['p95']:>9.1f} {latency['p99']:>9.1f} {stats['error_rate']:>7.1f}%")
+
+
+def parse_mix(values: List[str]) -> Dict[str, float]:
+    """['send_message=0.9', 'toggle_presence=0.1'] -> weights"""
+    mix = {}
+    for value in values:
+        operation, _, weight = value.partition('=')
+        if operation not in DEFAULT_MIX:
+            raise ValueError(f"Unknown operation in mix: {operation}")
+        mix[operation] = float(weight)
+    return mix
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Open-loop write load on the Devium chat data")
+    parser.add_argument("--database-url", default=None,
+                        help="database to load (default: an in-process local server)")
+    parser.add_argument("--api-key", default=None)
+    parser.add_argument("--fixture", default=None, help="JSON fixture for the local server")
+    parser.add_argument("--scale", type=int, default=1, help="synthetic dataset scale for the local server")
+    parser.add_argument("--latency", type=float, default=0.0, help="injected local server latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="injected local server 503 rate")
+    parser.add_argument("--rate", type=float, default=50.0, help="operations started per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--users", type=int, default=20, help="virtual users")
+    parser.add_argument("--max-in-flight", type=int, default=32, help="concurrent operations")
+    parser.add_argument("--mix", nargs="*", default=None,
+                        help="operation weights, e.g. send_message=0.8 toggle_presence=0.2")
+    parser.add_argument("--arrivals", choices=["poisson", "constant"], default="poisson")
+    parser.add_argument("--message-bytes", type=int, default=120)
+    parser.add_argument("--prefix", default="loadtest", help="id prefix for every node written")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--retries", type=int, default=0, help="transport retries per measured request")
+    parser.add_argument("--setup-retries", type=int, default=5,
+                        help="retries per request while creating users and conversations (not measured)")
+    parser.add_argument("--keep", action="store_true", help="keep the written nodes instead of deleting them")
+    parser.add_argument("--output", default="load_report.json", help="where to write results")
+    args = parser.parse_args()
+
+    server = None
+    database_url = args.database_url
+    if database_url is None:
+        if args.fixture:
+            with open(args.fixture, 'r') as f:
+                dataset = json.load(f)
+        else:
+            dataset = build_synthetic_fixture(args.scale)
+        server = LocalFirebaseServer(dataset, latency=args.latency, error_rate=args.error_rate, seed=0).start()
+        database_url = server.url
+
+    transport = FirebaseRestTransport(database_url, args.api_key, pool_size=args.max_in_flight,
+                                      max_retries=args.retries)
+    generator = ChatLoadGenerator(transport, virtual_users=args.users, rate=args.rate, duration=args.duration,
+                                  max_in_flight=args.max_in_flight,
+                                  mix=parse_mix(args.mix) if args.mix else None, arrivals=args.arrivals,
+                                  message_bytes=args.message_bytes, prefix=args.prefix, seed=args.seed,
+                                  setup_retries=args.setup_retries)
+
+    print("🔥 DEVIUM CHAT WRITE LOAD")
+    print("=" * 78)
+    print(f"Target: {database_url}")
+    print(f"{args.rate:g} ops/s ({args.arrivals}) for {args.duration:g}s, {args.users} virtual users, "
+          f"{args.max_in_flight} in flight")
+    print("=" * 78)
+    try:
+        try:
+            generator.setup()
+        except (RuntimeError, requests.RequestException) as e:
+            print(f"❌ Setup failed after {args.setup_retries} retries per request: {e}")
+            if not args.keep:
+                generator.cleanup()
+            raise SystemExit(1)
+        generator.run()
+        summary = generator.summary()
+        if not args.keep:
+            generator.cleanup()
+    finally:
+        transport.close()
+        if server is not None:
+            server.stop()
+
+    print_summary(summary)
+    if summary['late_dispatches']:
+        print(f"\n⚠️ {summary['late_dispatches']} operations were dispatched late; "
+              f"the generator could not sustain {args.rate:g} ops/s")
+    for message, count in summary['error_messages'].items():
+        print(f"❌ {count} × {message}")
+
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'config': {key: value for key, value in vars(args).items() if key not in ('api_key', 'output')},
+        'results': summary
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📄 Load results saved to: {args.output}")
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Compact index of an npm package-lock.json
+Streams the lockfile's packages one entry at a time into name -> versions
+and dependency edges, and persists the index keyed by the file's hash so
+repeat runs skip parsing entirely
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from json_stream import iter_object_items
+
+# 'requires' holds a lockfile v1 entry's edges; its 'dependencies' is the nested install tree
+DEPENDENCY_FIELDS = ('dependencies', 'optionalDependencies', 'peerDependencies', 'requires')
+
+
+def file_hash(path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+_SEMVER = re.compile(r'^v?(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?$')
+
+
+def version_key(version: str) -> Tuple:
+    """Semver ordering: numeric major.minor.patch, pre-releases before their release
+
+    Pre-release identifiers compare numerically when numeric and sort
+    before alphanumeric ones. Anything unparseable (git URLs, tags) sorts
+    first, by its text.
+    """
+    match = _SEMVER.match(version or '')
+    if match is None:
+        return (0, version or '')
+    core = tuple(int(part or 0) for part in match.group(1, 2, 3))
+    prerelease = match.group(4)
+    if prerelease is None:
+        return (1, core, 1, ())
+    identifiers = tuple((0, int(part), '') if part.isdigit() else (1, 0, part) for part in prerelease.split('.'))
+    return (1, core, 0, identifiers)
+
+
+def package_name(install_path: str) -> str:
+    """'node_modules/a/node_modules/@scope/b' -> '@scope/b'"""
+    return install_path.rsplit('node_modules/', 1)[-1]
+
+
+def _iter_v1_dependencies(dependencies: Dict[str, Any], parent: str = "") -> Iterator[Tuple[str, Dict]]:
+    """Flatten a lockfile v1 nested dependency tree into (install path, entry) pairs"""
+    for name, entry in dependencies.items():
+        install_path = f"{parent}node_modules/{name}"
+        yield install_path, entry
+        nested = entry.get('dependencies') if isinstance(entry, dict) else None
+        if isinstance(nested, dict) and any(isinstance(value, dict) for value in nested.values()):
+            yield from _iter_v1_dependencies(nested, install_path + '/')
+
+
+class LockfileIndex:
+    """Installed versions and dependency edges of one lockfile"""
+
+    def __init__(self, file_hash: str, root: Dict[str, Any], versions: Dict[str, List[str]],
+                 installs: Dict[str, str], edges: Dict[str, List[str]]):
+        self.file_hash = file_hash
+        self.root = root
+        # Cached indexes may predate semver ordering, so order on every load
+        self.versions = {name: sorted(found, key=version_key) for name, found in versions.items()}
+        self.installs = installs
+        self.edges = edges
+        self.reverse_edges = {}
+        for name, dependencies in edges.items():
+            for dependency in dependencies:
+                self.reverse_edges.setdefault(dependency, []).append(name)
+        self.from_cache = False
+
+    @classmethod
+    def parse(cls, lockfile_path: str, digest: Optional[str] = None) -> 'LockfileIndex':
+        """Build the index by streaming the lockfile's packages (v2/v3) or dependencies (v1)"""
+        versions = {}
+        installs = {}
+        edges = {}
+        root = {}
+
+        def add(install_path: str, entry: Any):
+            if not isinstance(entry, dict) or entry.get('link'):
+                return
+            name = entry.get('name') if not install_path else package_name(install_path)
+            version = entry.get('version')
+            if install_path and version:
+                installs[install_path] = version
+                known = versions.setdefault(name, [])
+                if version not in known:
+                    known.append(version)
+            dependencies = set()
+            for field in DEPENDENCY_FIELDS:
+                value = entry.get(field)
+                if isinstance(value, dict):
+                    dependencies.update(name for name, spec in value.items() if not isinstance(spec, dict))
+            if install_path and dependencies:
+                edges.setdefault(name, set()).update(dependencies)
+
+        with open(lockfile_path, 'rb') as f:
+            for install_path, entry in iter_object_items(f, ('packages',)):
+                if install_path == "":
+                    root = {field: entry.get(field, {}) for field in ('dependencies', 'devDependencies')}
+                add(install_path, entry)
+
+        if not installs:
+            # lockfileVersion 1 has no "packages" map; its tree lives under "dependencies"
+            with open(lockfile_path, 'rb') as f:
+                for name, entry in iter_object_items(f, ('dependencies',)):
+                    for install_path, nested_entry in _iter_v1_dependencies({name: entry}):
+                        add(install_path, nested_entry)
+
+        return cls(digest or file_hash(lockfile_path), root,
+                   {name: list(found) for name, found in versions.items()},
+                   installs,
+                   {name: sorted(dependencies) for name, dependencies in edges.items()})
+
+    @classmethod
+    def load(cls, lockfile_path: str, cache_path: Optional[str] = None) -> 'LockfileIndex':
+        """Reuse the persisted index when the lockfile's hash is unchanged, else parse and persist"""
+        digest = file_hash(lockfile_path)
+        if cache_path:
+            try:
+                with open(cache_path, 'r') as f:
+                    cached = json.load(f)
+                if cached.get('file_hash') == digest:
+                    index = cls(digest, cached['root'], cached['versions'], cached['installs'], cached['edges'])
+                    index.from_cache = True
+                    return index
+            except (OSError, ValueError, KeyError):
+                pass
+
+        index = cls.parse(lockfile_path, digest)
+        if cache_path:
+            index.save(cache_path)
+        return index
+
+    def save(self, cache_path: str):
+        directory = os.path.dirname(cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({'file_hash': self.file_hash, 'root': self.root, 'versions': self.versions,
+                       'installs': self.installs, 'edges': self.edges}, f, separators=(',', ':'))
+        os.replace(temp_path, cache_path)
+
+    @property
+    def install_count(self) -> int:
+        return len(self.installs)
+
+    def resolved_version(self, name: str) -> Optional[str]:
+        """Version hoisted to the top-level node_modules (what the app imports), else the lowest installed"""
+        version = self.installs.get(f"node_modules/{name}")
+        if version is None and self.versions.get(name):
+            version = self.versions[name][0]
+        return version
+
+    def duplicates(self) -> Dict[str, List[str]]:
+        """Packages installed at more than one version"""
+        return {name: found for name, found in self.versions.items() if len(found) > 1}
+
+    def dependents(self, name: str) -> List[str]:
+        """Packages that depend on name directly"""
+        return sorted(self.reverse_edges.get(name, []))
+
+    def transitive_dependencies(self, names: Iterable[str]) -> Set[str]:
+        """Every installed package reachable from names (excluding names themselves)"""
+        start = [name for name in names if name in self.versions]
+        seen = set(start)
+        queue = deque(start)
+        while queue:
+            for dependency in self.edges.get(queue.popleft(), []):
+                if dependency not in seen and dependency in self.versions:
+                    seen.add(dependency)
+                    queue.append(dependency)
+        return seen - set(start)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Cross-collection referential integrity checks
+Every referenced collection is indexed once as a hash set of its keys, then
+each referencing record is checked against those sets as it streams past,
+so a full pass is linear in the number of records and references
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class Reference:
+    """source[*].field must name a key of target (field None: the source's own keys must)"""
+    __slots__ = ('source', 'field', 'target')
+
+    def __init__(self, source: str, field: Optional[str], target: str):
+        self.source = source
+        self.field = field
+        self.target = target
+
+    @property
+    def label(self) -> str:
+        if self.field is None:
+            return f"{self.source} keys → {self.target}"
+        return f"{self.source}.{self.field} → {self.target}"
+
+
+# Devium's foreign keys
+REFERENCES = [
+    Reference('projects', 'teamId', 'teams'),
+    Reference('projects', 'assignedMembers', 'users'),
+    Reference('teams', 'members', 'users'),
+    Reference('teams', 'projects', 'projects'),
+    Reference('conversations', 'participants', 'users'),
+    Reference('messages', None, 'conversations')
+]
+
+
+def reference_values(value: Any) -> List[str]:
+    """Keys named by a reference field: a string, a list, or an RTDB map
+
+    Arrays may come back as {"0": id, ...} and membership sets as
+    {id: true, ...}; both are normalised to the referenced ids.
+    """
+    if value is None:
+        return []
+    if isinstance(value, (str, int)):
+        return [str(value)]
+    if isinstance(value, list):
+        return [str(item) for item in value if isinstance(item, (str, int))]
+    if isinstance(value, dict):
+        if all(isinstance(item, bool) for item in value.values()):
+            return [key for key, item in value.items() if item]
+        return [str(item) for item in value.values() if isinstance(item, (str, int))]
+    return []
+
+
+class IntegrityResult:
+    __slots__ = ('reference', 'checked', 'dangling', 'samples')
+
+    def __init__(self, reference: Reference):
+        self.reference = reference
+        self.checked = 0
+        self.dangling = 0
+        self.samples = []
+
+    def sample_labels(self) -> List[str]:
+        if self.reference.field is None:
+            return [f"{self.reference.source}/{key}" for key, _ in self.samples]
+        return [f"{self.reference.source}/{key} → {value}" for key, value in self.samples]
+
+
+class IntegrityChecker:
+    """Join references against hash indexes of their target collections
+
+    Call index() for every collection in shallow_collections(), then feed
+    check_record() the records of record_sources() and check_keys() the
+    keys of key-only sources; results() holds the dangling counts.
+    """
+
+    def __init__(self, references: Iterable[Reference] = REFERENCES, sample_size: int = 5):
+        self.references = list(references)
+        self.sample_size = max(0, sample_size)
+        self._keys = {}
+        self._results = [IntegrityResult(reference) for reference in self.references]
+        self._field_rules = {}
+        self._key_rules = {}
+        for result in self._results:
+            rules = self._key_rules if result.reference.field is None else self._field_rules
+            rules.setdefault(result.reference.source, []).append(result)
+
+    def shallow_collections(self) -> List[str]:
+        """Collections whose key sets are needed (targets and key-only sources)"""
+        return sorted({reference.target for reference in self.references} | set(self._key_rules))
+
+    def record_sources(self) -> List[str]:
+        """Collections whose records must be read to check their fields"""
+        return sorted(self._field_rules)
+
+    def index(self, collection: str, keys: Optional[Iterable[str]]):
+        """Record a collection's keys (None: the collection is empty or missing)"""
+        self._keys[collection] = set(keys or ())
+
+    def _check(self, result: IntegrityResult, source_key: str, value: str):
+        result.checked += 1
+        if value not in self._keys[result.reference.target]:
+            result.dangling += 1
+            if len(result.samples) < self.sample_size:
+                result.samples.append((source_key, value))
+
+    def check_record(self, collection: str, key: str, record: Any):
+        if not isinstance(record, dict):
+            return
+        for result in self._field_rules.get(collection, []):
+            for value in reference_values(record.get(result.reference.field)):
+                self._check(result, key, value)
+
+    def check_keys(self, collection: str, keys: Optional[Iterable[str]]):
+        for result in self._key_rules.get(collection, []):
+            for key in keys or ():
+                self._check(result, key, key)
+
+    def results(self) -> List[IntegrityResult]:
+        return list(self._results)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            result.reference.label: {
+                'checked': result.checked,
+                'dangling': result.dangling,
+                'samples': result.sample_labels()
+            }
+            for result in self._results
+        }
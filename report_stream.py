@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Streaming NDJSON test report
+Results are appended one line at a time while the tests run, followed by a
+compact summary footer, so a crash keeps everything logged so far and
+dashboards can tail partial runs
+"""
+
+import argparse
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class NDJSONReportWriter:
+    """Append-only report sink: header, one line per result, summary footer"""
+
+    def __init__(self, file_path: str, flush_every: int = 50, flush_interval: float = 1.0,
+                 metadata: Optional[Dict[str, Any]] = None):
+        self.file_path = file_path
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._file = open(file_path, 'w', encoding='utf-8')
+        self._write({'type': 'header', **(metadata or {})})
+        self.flush()
+
+    def _write(self, entry: Dict[str, Any]):
+        self._file.write(json.dumps(entry, separators=(',', ':'), ensure_ascii=False) + '\n')
+
+    def write_result(self, status: str, test: str, message: str):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._write({'type': 'result', 'status': status, 'test': test, 'message': message})
+            self._pending += 1
+            # Flush in batches, but often enough for tailing readers to see progress
+            if self._pending >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush_locked()
+
+    def write_update(self, update: Dict[str, Any]):
+        """Write an interim summary (e.g. after a watch-mode re-run) and flush it"""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._write({'type': 'update', **update})
+            self._flush_locked()
+
+    def write_summary(self, summary: Dict[str, Any]):
+        """Write the footer and close the file"""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._write({'type': 'summary', **summary})
+            self._file.close()
+
+    def flush(self):
+        with self._lock:
+            if not self._file.closed:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        self._file.flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+def load_report(file_path: str, include_details: bool = True) -> Dict[str, Any]:
+    """Rebuild the test_report.json structure from an NDJSON report
+
+    Works on partial reports: without a footer, the summary is computed
+    from the result lines read so far and 'complete' is False. Watch-mode
+    reports re-log suites on every change, so there the latest update
+    line's summary is used instead of counting result lines.
+    """
+    counts = {'passed': 0, 'failed': 0, 'warnings': 0}
+    details = {'passed': [], 'failed': [], 'warnings': []}
+    header = {}
+    footer = None
+    update = None
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.endswith('\n'):
+                break  # a line still being written by the tester
+            entry = json.loads(line)
+            entry_type = entry.get('type')
+            if entry_type == 'result':
+                status = entry.get('status')
+                if status in counts:
+                    counts[status] += 1
+                    if include_details:
+                        details[status].append({'test': entry.get('test', ''), 'message': entry.get('message', '')})
+            elif entry_type == 'header':
+                header = entry
+            elif entry_type == 'update':
+                update = entry
+            elif entry_type == 'summary':
+                footer = entry
+
+    total = sum(counts.values())
+    report = {
+        'summary': {
+            'total': total,
+            'passed': counts['passed'],
+            'failed': counts['failed'],
+            'warnings': counts['warnings'],
+            'success_rate': (counts['passed'] / total * 100) if total > 0 else 0
+        },
+        'details': dict(details, timestamp=header.get('timestamp')) if include_details else {},
+        'complete': footer is not None
+    }
+    if update is not None:
+        report['summary'] = update['summary']
+        report['watch'] = {key: value for key, value in update.items() if key not in ('type', 'summary')}
+    if footer is not None:
+        extras = {key: value for key, value in footer.items() if key != 'type'}
+        report.update(extras)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize a (possibly partial) NDJSON test report")
+    parser.add_argument("report", nargs="?", default="test_report.ndjson")
+    parser.add_argument("--json", action="store_true", help="print the rebuilt report as JSON")
+    args = parser.parse_args()
+
+    rebuilt = load_report(args.report, include_details=args.json)
+    if args.json:
+        print(json.dumps(rebuilt, indent=2, ensure_ascii=False))
+    else:
+        summary = rebuilt['summary']
+        state = "complete" if rebuilt['complete'] else "in progress"
+        print(f"📊 {args.report} ({state})")
+        print(f"Total Tests: {summary['total']}")
+        print(f"✅ Passed: {summary['passed']}")
+        print(f"❌ Failed: {summary['failed']}")
+        print(f"⚠️ Warnings: {summary['warnings']}")
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Compact result recorder for the Devium test scripts
+Keeps typed, slot-based records (or just counters and a bounded sample in
+summary-only mode) and batches console output so large runs stay cheap
+"""
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import Any, Dict, List, Optional, TextIO
+
+
+class Status(Enum):
+    """Outcome of a single check; values match the report's detail keys"""
+    PASSED = 'passed'
+    FAILED = 'failed'
+    WARNING = 'warnings'
+
+    @property
+    def symbol(self) -> str:
+        return _SYMBOLS[self]
+
+
+_SYMBOLS = {Status.PASSED: "✅", Status.FAILED: "❌", Status.WARNING: "⚠️"}
+_STATUS_BY_SYMBOL = {symbol: status for status, symbol in _SYMBOLS.items()}
+_STATUS_BY_SYMBOL["⚠"] = Status.WARNING
+
+
+def parse_status(status: Any) -> Optional[Status]:
+    """Accept a Status or one of the emoji the testers log with"""
+    if isinstance(status, Status):
+        return status
+    return _STATUS_BY_SYMBOL.get(status.strip())
+
+
+class ResultRecord:
+    __slots__ = ('status', 'test', 'message')
+
+    def __init__(self, status: Status, test: str, message: str):
+        self.status = status
+        self.test = test
+        self.message = message
+
+    def to_dict(self) -> Dict[str, str]:
+        return {"test": self.test, "message": self.message}
+
+
+class ResultGroup:
+    """Results and console lines held back until the group is committed
+
+    With a limit (summary-only recorders) only the first `limit` results of
+    each status are held; later ones are counted here and recorded straight
+    away without being echoed, so a group's memory stays bounded.
+    """
+    __slots__ = ('name', 'entries', 'counts', 'limit', 'overflow', '_lock')
+
+    def __init__(self, name: str = "", limit: Optional[int] = None):
+        self.name = name
+        self.entries = []
+        self.counts = {status: 0 for status in Status}
+        self.limit = limit
+        self.overflow = 0
+        # Worker threads of one suite may join the same group
+        self._lock = threading.Lock()
+
+    def hold(self, status: Any, parsed: Optional[Status], message: str, test_name: Optional[str]) -> bool:
+        """Keep an entry until commit; False when it is over the limit and must be recorded now"""
+        with self._lock:
+            if parsed is not None:
+                self.counts[parsed] += 1
+                if self.limit is not None and self.counts[parsed] > self.limit:
+                    # Passed results are never echoed in summary-only mode, so only these go unseen
+                    if parsed is not Status.PASSED:
+                        self.overflow += 1
+                    return False
+            self.entries.append((status, message, test_name))
+            return True
+
+
+class ResultRecorder:
+    """Thread-safe store for check results with buffered console output
+
+    summary_only keeps per-status and per-test counters plus the first
+    sample_size records of each status instead of every record, and only
+    echoes failures and warnings. max_lines_per_second caps console output;
+    suppressed lines are counted and reported on flush. An optional sink
+    (e.g. NDJSONReportWriter) receives every result regardless of mode.
+    Inside grouped(), results from the current thread are held in a
+    ResultGroup and only stored and echoed on commit(), so concurrent
+    suites print as contiguous blocks.
+    """
+
+    def __init__(self, summary_only: bool = False, sample_size: int = 20, echo: bool = True,
+                 buffer_lines: int = 64, max_lines_per_second: Optional[int] = None,
+                 stream: TextIO = None, sink: Any = None):
+        self.summary_only = summary_only
+        self.sample_size = sample_size
+        self.echo_results = echo
+        self.buffer_lines = max(1, buffer_lines)
+        self.max_lines_per_second = max_lines_per_second
+        self.stream = stream
+        self.sink = sink
+
+        self.counts = {status: 0 for status in Status}
+        self.test_counts = {}
+        self._records = {status: [] for status in Status}
+        self._lock = threading.RLock()
+        self._buffer = []
+        self._suppressed = 0
+        self._rate_window = 0
+        self._rate_count = 0
+        self._clock_second = None
+        self._clock_text = ""
+        # Per thread and per asyncio task, so concurrent suites never share a group
+        self._group = ContextVar(f'result_group_{id(self)}', default=None)
+
+    def _timestamp(self) -> str:
+        # Formatting a timestamp per line is costly; reuse it within the same second
+        now = int(time.time())
+        if now != self._clock_second:
+            self._clock_second = now
+            self._clock_text = time.strftime("%H:%M:%S", time.localtime(now))
+        return self._clock_text
+
+    def record(self, status: Any, message: str, test_name: str = ""):
+        """Store one result and echo it to the console"""
+        group = self._group.get()
+        parsed = parse_status(status)
+        if group is not None and group.hold(status, parsed, message, test_name):
+            return
+        with self._lock:
+            if parsed is not None:
+                test_name = sys.intern(test_name)
+                self.counts[parsed] += 1
+                per_test = self.test_counts.get(test_name)
+                if per_test is None:
+                    per_test = self.test_counts[test_name] = {status.value: 0 for status in Status}
+                per_test[parsed.value] += 1
+                records = self._records[parsed]
+                if not self.summary_only or len(records) < self.sample_size:
+                    records.append(ResultRecord(parsed, test_name, message))
+                if self.sink is not None:
+                    self.sink.write_result(parsed.value, test_name, message)
+
+            # Results past a group's limit are counted but never echoed (it would break the block)
+            if self.echo_results and group is None and not (self.summary_only and parsed is Status.PASSED):
+                symbol = parsed.symbol if parsed is not None else status
+                prefix = f"[{self._timestamp()}] {symbol}"
+                self._emit(f"{prefix} [{test_name}] {message}" if test_name else f"{prefix} {message}")
+
+    def echo(self, line: str = ""):
+        """Write a plain console line in order with buffered results"""
+        group = self._group.get()
+        if group is not None:
+            group.hold(None, None, line, None)
+            return
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.buffer_lines:
+                self.flush()
+
+    def current_group(self) -> Optional[ResultGroup]:
+        return self._group.get()
+
+    @contextmanager
+    def grouped(self, name: str = ""):
+        """Hold this thread's results in a new group until commit()"""
+        limit = self.sample_size if self.summary_only else None
+        with self.joined(ResultGroup(name, limit)) as group:
+            yield group
+
+    @contextmanager
+    def joined(self, group: Optional[ResultGroup]):
+        """Route this thread's results into an existing group (None = record directly)"""
+        token = self._group.set(group)
+        try:
+            yield group
+        finally:
+            self._group.reset(token)
+
+    def commit(self, group: ResultGroup):
+        """Store and echo a group's held entries as one uninterrupted block
+
+        The group keeps its (bounded) entries and counts, so callers can
+        re-summarize it later.
+        """
+        token = self._group.set(None)
+        try:
+            with self._lock:
+                for status, message, test_name in group.entries:
+                    if status is None:
+                        self.echo(message)
+                    else:
+                        self.record(status, message, test_name)
+                if group.overflow:
+                    self.echo(f"… {group.overflow} more failures and warnings not shown (summary-only)")
+        finally:
+            self._group.reset(token)
+
+    def _emit(self, line: str):
+        if self.max_lines_per_second:
+            window = int(time.monotonic())
+            if window != self._rate_window:
+                self._rate_window = window
+                self._rate_count = 0
+            self._rate_count += 1
+            if self._rate_count > self.max_lines_per_second:
+                self._suppressed += 1
+                return
+        self._buffer.append(line)
+        if len(self._buffer) >= self.buffer_lines:
+            self.flush()
+
+    def flush(self):
+        """Write buffered console lines"""
+        with self._lock:
+            if self._suppressed:
+                self._buffer.append(f"… {self._suppressed} result lines suppressed by rate limit")
+                self._suppressed = 0
+            if self._buffer:
+                stream = self.stream or sys.stdout
+                stream.write('\n'.join(self._buffer) + '\n')
+                stream.flush()
+                self._buffer = []
+
+    def count(self, status: Status) -> int:
+        return self.counts[status]
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def records(self, status: Status) -> List[ResultRecord]:
+        """Stored records for a status (a bounded sample in summary-only mode)"""
+        with self._lock:
+            return list(self._records[status])
+
+    def details(self) -> Dict[str, Any]:
+        """Results in the report's {'passed': [...], 'failed': [...], 'warnings': [...]} shape"""
+        with self._lock:
+            details = {status.value: [record.to_dict() for record in self._records[status]]
+                       for status in Status}
+            if self.summary_only:
+                details['sampled'] = True
+                details['by_test'] = {test: dict(counts) for test, counts in self.test_counts.items()}
+            return details
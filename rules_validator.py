@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+Audit existing data against firebase-rules.json
+Each .validate expression is parsed once and compiled into a Python closure
+over the node being checked; the closures then run in bulk over fetched
+collections, so data written before a rule tightened can be found without
+a request per node
+"""
+
+import ast
+import json
+import re
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class RuleSyntaxError(ValueError):
+    """Raised for rule expressions outside the supported subset"""
+
+
+class _Unknown:
+    """A value that depends on auth, root or other state an audit cannot see"""
+
+    def __repr__(self):
+        return 'UNKNOWN'
+
+
+UNKNOWN = _Unknown()
+
+
+class _Snapshot:
+    """newData (or one of its children) inside a compiled expression"""
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def child(self, key: Any) -> '_Snapshot':
+        value = self.value
+        if isinstance(value, dict):
+            return _Snapshot(value.get(str(key)))
+        if isinstance(value, list) and str(key).isdigit() and int(key) < len(value):
+            return _Snapshot(value[int(key)])
+        return _Snapshot(None)
+
+    def has_child(self, key: Any) -> bool:
+        return self.child(key).value is not None
+
+
+def _snapshot_method(snapshot: _Snapshot, name: str, args: List[Any]) -> Any:
+    if name == 'child' and len(args) == 1:
+        return snapshot.child(args[0])
+    if name == 'exists' and not args:
+        return snapshot.value is not None
+    if name == 'val' and not args:
+        return snapshot.value
+    if name == 'hasChild' and len(args) == 1:
+        return snapshot.has_child(args[0])
+    if name == 'hasChildren' and not args:
+        return isinstance(snapshot.value, (dict, list)) and len(snapshot.value) > 0
+    if name == 'hasChildren' and len(args) == 1 and isinstance(args[0], list):
+        return all(snapshot.has_child(key) for key in args[0])
+    if name == 'isString' and not args:
+        return isinstance(snapshot.value, str)
+    if name == 'isNumber' and not args:
+        return isinstance(snapshot.value, (int, float)) and not isinstance(snapshot.value, bool)
+    if name == 'isBoolean' and not args:
+        return isinstance(snapshot.value, bool)
+    return UNKNOWN
+
+
+def _string_method(value: str, name: str, args: List[Any]) -> Any:
+    if len(args) == 1 and isinstance(args[0], str):
+        if name == 'contains':
+            return args[0] in value
+        if name == 'beginsWith':
+            return value.startswith(args[0])
+        if name == 'endsWith':
+            return value.endswith(args[0])
+    if not args and name == 'toLowerCase':
+        return value.lower()
+    if not args and name == 'toUpperCase':
+        return value.upper()
+    return UNKNOWN
+
+
+def _call(target: Any, name: str, args: List[Any]) -> Any:
+    if target is UNKNOWN or any(arg is UNKNOWN for arg in args):
+        return UNKNOWN
+    if isinstance(target, _Snapshot):
+        return _snapshot_method(target, name, args)
+    if isinstance(target, str):
+        return _string_method(target, name, args)
+    return UNKNOWN
+
+
+def _length(value: Any) -> Any:
+    return len(value) if isinstance(value, str) else UNKNOWN
+
+
+def _compare(operator: str, left: Any, right: Any) -> Any:
+    if left is UNKNOWN or right is UNKNOWN or isinstance(left, _Snapshot) or isinstance(right, _Snapshot):
+        return UNKNOWN
+    if operator in ('===', '=='):
+        return left == right
+    if operator in ('!==', '!='):
+        return left != right
+    try:
+        if operator == '<':
+            return left < right
+        if operator == '>':
+            return left > right
+        if operator == '<=':
+            return left <= right
+        return left >= right
+    except TypeError:
+        return False
+
+
+# A node, plus the $wildcard captures on its path, evaluated to a value, a _Snapshot or UNKNOWN
+Evaluator = Callable[[Any, Dict[str, str]], Any]
+
+_TOKEN = re.compile(r"""\s*(?:
+    (?P<number>\d+(?:\.\d+)?)
+  | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+  | (?P<name>\$?[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<op>===|!==|==|!=|<=|>=|&&|\|\||[!<>()\[\],.])
+)""", re.VERBOSE)
+
+
+def _tokenize(source: str) -> List[Tuple[str, str]]:
+    tokens = []
+    position = 0
+    source = source.rstrip()
+    while position < len(source):
+        match = _TOKEN.match(source, position)
+        if match is None or match.end() == position:
+            raise RuleSyntaxError(f"Unsupported syntax at {position}: {source[position:position + 20]!r}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+
+# What an expression can evaluate to during an audit; a rule whose outcomes
+# never include FALSE can never report a violation, so it is not worth a download
+TRUE, FALSE, VALUE, NOT_KNOWN, SNAPSHOT, NEW_DATA = 'true', 'false', 'value', 'unknown', 'snapshot', 'newData'
+_BOOLEAN = frozenset((TRUE, FALSE))
+_SNAPSHOT_OUTCOMES = {
+    'child': {SNAPSHOT},
+    'val': {TRUE, FALSE, VALUE},
+    'hasChild': {TRUE, FALSE},
+    'hasChildren': {TRUE, FALSE},
+    'isString': {TRUE, FALSE},
+    'isNumber': {TRUE, FALSE},
+    'isBoolean': {TRUE, FALSE}
+}
+_STRING_OUTCOMES = {
+    'contains': {TRUE, FALSE},
+    'beginsWith': {TRUE, FALSE},
+    'endsWith': {TRUE, FALSE},
+    'toLowerCase': {VALUE},
+    'toUpperCase': {VALUE}
+}
+Compiled = Tuple[Evaluator, frozenset]
+
+
+def _call_outcomes(target: frozenset, name: str, args: List[frozenset]) -> frozenset:
+    outcomes = set()
+    if NOT_KNOWN in target or any(NOT_KNOWN in arg for arg in args) or target & _BOOLEAN:
+        outcomes.add(NOT_KNOWN)
+    if NEW_DATA in target:
+        # The audited node itself is never null, so newData.exists() always holds
+        outcomes |= {TRUE} if name == 'exists' else _SNAPSHOT_OUTCOMES.get(name, {NOT_KNOWN})
+    if SNAPSHOT in target:
+        outcomes |= {TRUE, FALSE} if name == 'exists' else _SNAPSHOT_OUTCOMES.get(name, {NOT_KNOWN})
+    if VALUE in target:
+        outcomes |= _STRING_OUTCOMES.get(name, set()) | {NOT_KNOWN}
+    return frozenset(outcomes)
+
+
+class _Compiler:
+    """Recursive-descent compiler for the boolean subset of the rules language
+
+    Expressions compile to closures with three-valued logic: terms that
+    need auth, root, data or now evaluate to UNKNOWN, and a rule only
+    reports a violation when the node's own data makes it false. Each
+    closure comes with the set of outcomes it can possibly produce.
+    """
+
+    def __init__(self, source: str):
+        self.tokens = _tokenize(source)
+        self.position = 0
+        self.reads_node = False
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.position][1] if self.position < len(self.tokens) else None
+
+    def _next(self) -> Tuple[str, str]:
+        if self.position >= len(self.tokens):
+            raise RuleSyntaxError("Unexpected end of expression")
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def _expect(self, value: str):
+        kind, found = self._next()
+        if found != value:
+            raise RuleSyntaxError(f"Expected {value!r}, found {found!r}")
+
+    def compile(self) -> Compiled:
+        compiled = self._or()
+        if self.position != len(self.tokens):
+            raise RuleSyntaxError(f"Unexpected {self._peek()!r}")
+        return compiled
+
+    def _or(self) -> Compiled:
+        compiled = [self._and()]
+        while self._peek() == '||':
+            self._next()
+            compiled.append(self._and())
+        if len(compiled) == 1:
+            return compiled[0]
+        terms = [term for term, _ in compiled]
+
+        def evaluate_or(node, captures):
+            result = False
+            for term in terms:
+                value = term(node, captures)
+                if value is True:
+                    return True
+                if value is not False:
+                    result = UNKNOWN
+            return result
+
+        outcomes = set()
+        if any(TRUE in term_outcomes for _, term_outcomes in compiled):
+            outcomes.add(TRUE)
+        if all(FALSE in term_outcomes for _, term_outcomes in compiled):
+            outcomes.add(FALSE)
+        if any(term_outcomes - _BOOLEAN for _, term_outcomes in compiled):
+            outcomes.add(NOT_KNOWN)
+        return evaluate_or, frozenset(outcomes)
+
+    def _and(self) -> Compiled:
+        compiled = [self._not()]
+        while self._peek() == '&&':
+            self._next()
+            compiled.append(self._not())
+        if len(compiled) == 1:
+            return compiled[0]
+        terms = [term for term, _ in compiled]
+
+        def evaluate_and(node, captures):
+            result = True
+            for term in terms:
+                value = term(node, captures)
+                if value is False:
+                    return False
+                if value is not True:
+                    result = UNKNOWN
+            return result
+
+        outcomes = set()
+        if all(TRUE in term_outcomes for _, term_outcomes in compiled):
+            outcomes.add(TRUE)
+        if any(FALSE in term_outcomes for _, term_outcomes in compiled):
+            outcomes.add(FALSE)
+        if any(term_outcomes - _BOOLEAN for _, term_outcomes in compiled):
+            outcomes.add(NOT_KNOWN)
+        return evaluate_and, frozenset(outcomes)
+
+    def _not(self) -> Compiled:
+        if self._peek() == '!':
+            self._next()
+            operand, operand_outcomes = self._not()
+
+            def evaluate_not(node, captures):
+                value = operand(node, captures)
+                return (not value) if isinstance(value, bool) else UNKNOWN
+
+            outcomes = {FALSE if outcome == TRUE else TRUE for outcome in operand_outcomes & _BOOLEAN}
+            if operand_outcomes - _BOOLEAN:
+                outcomes.add(NOT_KNOWN)
+            return evaluate_not, frozenset(outcomes)
+        return self._comparison()
+
+    def _comparison(self) -> Compiled:
+        left, left_outcomes = self._postfix()
+        if self._peek() in ('===', '!==', '==', '!=', '<', '>', '<=', '>='):
+            operator = self._next()[1]
+            right, right_outcomes = self._postfix()
+            outcomes = set()
+            opaque = {NOT_KNOWN, SNAPSHOT, NEW_DATA}
+            if left_outcomes & opaque or right_outcomes & opaque:
+                outcomes.add(NOT_KNOWN)
+            if left_outcomes - opaque and right_outcomes - opaque:
+                outcomes |= _BOOLEAN
+            return (lambda node, captures: _compare(operator, left(node, captures), right(node, captures)),
+                    frozenset(outcomes))
+        return left, left_outcomes
+
+    def _postfix(self) -> Compiled:
+        evaluator, outcomes = self._primary()
+        while self._peek() == '.':
+            self._next()
+            kind, name = self._next()
+            if kind != 'name':
+                raise RuleSyntaxError(f"Expected a member name, found {name!r}")
+            if self._peek() == '(':
+                compiled_args = self._arguments()
+                args = [arg for arg, _ in compiled_args]
+                outcomes = _call_outcomes(outcomes, name, [arg_outcomes for _, arg_outcomes in compiled_args])
+                evaluator = (lambda target, name, args: lambda node, captures: _call(
+                    target(node, captures), name, [arg(node, captures) for arg in args]))(evaluator, name, args)
+            elif name == 'length':
+                evaluator = (lambda target: lambda node, captures: _length(target(node, captures)))(evaluator)
+                outcomes = frozenset((VALUE, NOT_KNOWN))
+            else:
+                # Properties such as auth.uid or auth.token.email
+                evaluator = lambda node, captures: UNKNOWN
+                outcomes = frozenset((NOT_KNOWN,))
+        return evaluator, outcomes
+
+    def _arguments(self) -> List[Compiled]:
+        self._expect('(')
+        args = []
+        while self._peek() != ')':
+            args.append(self._or())
+            if self._peek() == ',':
+                self._next()
+        self._expect(')')
+        return args
+
+    def _primary(self) -> Compiled:
+        kind, value = self._next()
+        if value == '(':
+            compiled = self._or()
+            self._expect(')')
+            return compiled
+        if value == '[':
+            items = []
+            while self._peek() != ']':
+                items.append(self._or()[0])
+                if self._peek() == ',':
+                    self._next()
+            self._expect(']')
+            return lambda node, captures: [item(node, captures) for item in items], frozenset((VALUE,))
+        if kind == 'number':
+            constant = float(value) if '.' in value else int(value)
+            return lambda node, captures: constant, frozenset((VALUE,))
+        if kind == 'string':
+            constant = ast.literal_eval(value)
+            return lambda node, captures: constant, frozenset((VALUE,))
+        if kind == 'name':
+            if value in ('true', 'false'):
+                constant = value == 'true'
+                return lambda node, captures: constant, frozenset((TRUE if constant else FALSE,))
+            if value == 'null':
+                return lambda node, captures: None, frozenset((VALUE,))
+            if value == 'newData':
+                self.reads_node = True
+                return lambda node, captures: _Snapshot(node), frozenset((NEW_DATA,))
+            if value.startswith('$'):
+                self.reads_node = True
+                return lambda node, captures: captures.get(value, UNKNOWN), frozenset((VALUE, NOT_KNOWN))
+            # auth, root, data, now and anything else are outside what an audit can see
+            return lambda node, captures: UNKNOWN, frozenset((NOT_KNOWN,))
+        raise RuleSyntaxError(f"Unexpected {value!r}")
+
+
+def compile_expression(source: str) -> Optional[Evaluator]:
+    """Compile a rule expression (None when the node's own data can never make it false)"""
+    compiler = _Compiler(source)
+    evaluator, outcomes = compiler.compile()
+    return evaluator if compiler.reads_node and FALSE in outcomes else None
+
+
+class CompiledRule:
+    __slots__ = ('pattern', 'source', 'evaluate')
+
+    def __init__(self, pattern: List[str], source: str, evaluate: Evaluator):
+        self.pattern = pattern
+        self.source = source
+        self.evaluate = evaluate
+
+    @property
+    def path(self) -> str:
+        return '/'.join(self.pattern)
+
+
+class ValidationResult:
+    __slots__ = ('collection', 'checked', 'violations', 'samples', 'elapsed')
+
+    def __init__(self, collection: str):
+        self.collection = collection
+        self.checked = 0
+        self.violations = {}
+        self.samples = {}
+        self.elapsed = 0.0
+
+    @property
+    def violation_count(self) -> int:
+        return sum(self.violations.values())
+
+
+class RulesValidator:
+    """.validate rules from a rules file, grouped by top-level collection
+
+    Rules the data alone can never make false (auth checks, root lookups,
+    or terms such as newData.exists() that always hold) are listed in
+    skipped rather than compiled, so their collections are not read.
+    """
+
+    def __init__(self, rules: Dict[str, Any], sample_size: int = 5):
+        self.sample_size = max(0, sample_size)
+        self.rules = {}
+        self.skipped = []
+        self._walk_rules(rules.get('rules', rules), [])
+
+    @classmethod
+    def load(cls, path: str = 'firebase-rules.json', sample_size: int = 5) -> 'RulesValidator':
+        with open(path, 'r') as f:
+            return cls(json.load(f), sample_size=sample_size)
+
+    def _walk_rules(self, node: Dict[str, Any], pattern: List[str]):
+        for key, value in node.items():
+            if key == '.validate' and isinstance(value, str) and pattern and not pattern[0].startswith('$'):
+                try:
+                    evaluate = compile_expression(value)
+                except RuleSyntaxError:
+                    evaluate = None
+                if evaluate is None:
+                    self.skipped.append('/'.join(pattern))
+                else:
+                    self.rules.setdefault(pattern[0], []).append(CompiledRule(list(pattern), value, evaluate))
+            elif not key.startswith('.') and isinstance(value, dict):
+                self._walk_rules(value, pattern + [key])
+
+    @property
+    def collections(self) -> List[str]:
+        return sorted(self.rules)
+
+    def _check(self, rule: CompiledRule, depth: int, node: Any, path: str, captures: Dict[str, str],
+               result: ValidationResult):
+        """Evaluate rule at every node under path that matches its pattern from depth on"""
+        if node is None:
+            return
+        if depth == len(rule.pattern):
+            result.checked += 1
+            if rule.evaluate(node, captures) is False:
+                result.violations[rule.path] = result.violations.get(rule.path, 0) + 1
+                samples = result.samples.setdefault(rule.path, [])
+                if len(samples) < self.sample_size:
+                    samples.append(path)
+            return
+
+        segment = rule.pattern[depth]
+        if isinstance(node, list):
+            node = {str(index): child for index, child in enumerate(node) if child is not None}
+        if not isinstance(node, dict):
+            return
+        if segment.startswith('$'):
+            for key, child in node.items():
+                self._check(rule, depth + 1, child, f"{path}/{key}", dict(captures, **{segment: key}), result)
+        elif segment in node:
+            self._check(rule, depth + 1, node[segment], f"{path}/{segment}", captures, result)
+
+    def validate(self, collection: str, items: Iterable[Tuple[str, Any]]) -> ValidationResult:
+        """Check one collection given as (key, child) pairs, e.g. from a paged or streamed read"""
+        start = time.perf_counter()
+        result = ValidationResult(collection)
+        rules = self.rules.get(collection, [])
+        whole_rules = [rule for rule in rules if len(rule.pattern) == 1]
+        child_rules = [rule for rule in rules if len(rule.pattern) > 1]
+        whole = {} if whole_rules else None
+
+        for key, child in items:
+            if whole is not None:
+                whole[key] = child
+            for rule in child_rules:
+                segment = rule.pattern[1]
+                if segment.startswith('$'):
+                    self._check(rule, 2, child, f"{collection}/{key}", {segment: key}, result)
+                elif segment == key:
+                    self._check(rule, 2, child, f"{collection}/{key}", {}, result)
+
+        for rule in whole_rules:
+            self._check(rule, 1, whole or None, collection, {}, result)
+        result.elapsed = time.perf_counter() - start
+        return result
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Single-pass source index for the static code checks
+Walks the source tree once, matches every pattern against each file's
+text read once, and caches matches by path, mtime and content hash so
+unchanged files are not rescanned
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+class PatternMatcher:
+    """Multi-pattern substring matcher
+
+    Each pattern is a separate `in` check, which runs in C and beats a
+    single per-character pass in Python (or one regex alternation) for the
+    handful of patterns the checks use.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = sorted(set(pattern for pattern in patterns if pattern))
+
+    def search(self, text: str) -> Set[str]:
+        """Patterns that occur anywhere in text"""
+        return {pattern for pattern in self.patterns if pattern in text}
+
+
+class SourceIndex:
+    """Which patterns occur in which source files
+
+    patterns are matched case-sensitively; ignore_case_patterns are
+    matched against the lower-cased text. Matches are cached in
+    cache_path keyed by file path, then validated by mtime and size and,
+    when those changed, by a content hash before rescanning.
+    """
+
+    def __init__(self, root: str = 'src', patterns: Iterable[str] = (), ignore_case_patterns: Iterable[str] = (),
+                 extensions: Iterable[str] = ('.ts', '.tsx'), cache_path: Optional[str] = None,
+                 max_workers: int = 8):
+        self.root = root
+        self.extensions = tuple(extensions)
+        self.cache_path = cache_path
+        self.max_workers = max(1, max_workers)
+        self._matcher = PatternMatcher(patterns)
+        self._ignore_case_matcher = PatternMatcher(pattern.lower() for pattern in ignore_case_patterns)
+        self._signature = hashlib.sha256(json.dumps(
+            [self._matcher.patterns, self._ignore_case_matcher.patterns]).encode('utf-8')).hexdigest()
+        self._files = {}
+        self.scanned = 0
+        self.reused = 0
+
+    def _walk(self) -> List[str]:
+        paths = []
+        for directory, subdirectories, files in os.walk(self.root):
+            subdirectories[:] = sorted(name for name in subdirectories if name != 'node_modules')
+            for name in sorted(files):
+                if name.endswith(self.extensions):
+                    paths.append(os.path.join(directory, name).replace(os.sep, '/'))
+        return paths
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, 'r') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # Matches recorded for a different pattern set cannot be reused
+        return cached.get('files', {}) if cached.get('signature') == self._signature else {}
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        directory = os.path.dirname(self.cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({'signature': self._signature, 'files': self._files}, f)
+        os.replace(temp_path, self.cache_path)
+
+    def _read_file(self, path: str, cached: Optional[Dict]) -> Tuple[Dict, Optional[str]]:
+        """Reuse the cached entry when the file is unchanged, else return a new entry and the text to scan"""
+        stat = os.stat(path)
+        if cached and cached['mtime'] == stat.st_mtime and cached['size'] == stat.st_size:
+            return dict(cached, reused=True), None
+
+        with open(path, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if cached and cached['hash'] == digest:
+            # Touched but unchanged: keep the matches, refresh the stat key
+            return dict(cached, mtime=stat.st_mtime, size=stat.st_size, reused=True), None
+        return {'mtime': stat.st_mtime, 'size': stat.st_size, 'hash': digest}, raw.decode('utf-8', errors='replace')
+
+    def _scan(self, entry: Dict, text: str) -> Dict:
+        matches = self._matcher.search(text)
+        matches_ignore_case = self._ignore_case_matcher.search(text.lower())
+        return dict(entry, matches=sorted(matches), matches_ignore_case=sorted(matches_ignore_case), reused=False)
+
+    def build(self, extra_files: Iterable[str] = ()) -> 'SourceIndex':
+        """Index every source file under root (plus extra_files); files are read in parallel"""
+        paths = self._walk()
+        paths += [path for path in extra_files if path not in paths and os.path.isfile(path)]
+        cached = self._load_cache()
+
+        # Reads and hashes release the GIL; matching holds it, so it stays on this thread
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, max(1, len(paths)))) as executor:
+            read = list(executor.map(lambda path: self._read_file(path, cached.get(path)), paths))
+
+        self._files = {}
+        for path, (entry, text) in zip(paths, read):
+            if text is not None:
+                entry = self._scan(entry, text)
+            if entry.pop('reused'):
+                self.reused += 1
+            else:
+                self.scanned += 1
+            self._files[path] = entry
+        self._save_cache()
+        return self
+
+    @property
+    def files(self) -> List[str]:
+        return list(self._files)
+
+    def has_file(self, path: str) -> bool:
+        return path in self._files
+
+    def contains(self, path: str, pattern: str, ignore_case: bool = False) -> bool:
+        """Whether pattern occurs in an indexed file (raises FileNotFoundError if not indexed)"""
+        entry = self._files.get(path)
+        if entry is None:
+            raise FileNotFoundError(f"No such file in source index: {path}")
+        if ignore_case:
+            return pattern.lower() in entry['matches_ignore_case']
+        return pattern in entry['matches']
+
+    def files_containing(self, pattern: str, ignore_case: bool = False) -> List[str]:
+        key = 'matches_ignore_case' if ignore_case else 'matches'
+        needle = pattern.lower() if ignore_case else pattern
+        return [path for path, entry in self._files.items() if needle in entry[key]]
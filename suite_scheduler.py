@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Dependency-aware scheduler for test suites
+Data loaders and suites form a DAG; each node runs on a worker pool as soon
+as everything it requires has finished, so total run time approaches the
+longest dependency chain instead of the sum of all suites
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Optional
+
+
+class SchedulerError(Exception):
+    """Raised for unknown dependencies or dependency cycles"""
+
+
+class NodeResult:
+    __slots__ = ('name', 'value', 'error', 'started', 'finished', 'skipped')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.value = None
+        self.error = None
+        self.started = 0.0
+        self.finished = 0.0
+        self.skipped = False
+
+    @property
+    def duration(self) -> float:
+        return max(0.0, self.finished - self.started)
+
+
+class SuiteScheduler:
+    """Run named callables once their declared requirements have completed"""
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max(1, max_workers)
+        self._nodes = {}
+        self._order = []
+
+    def add(self, name: str, func: Callable[[], Any], requires: Optional[List[str]] = None):
+        if name in self._nodes:
+            raise SchedulerError(f"Duplicate node: {name}")
+        self._nodes[name] = (func, list(requires or []))
+        self._order.append(name)
+
+    def _validate(self):
+        for name, (_, requires) in self._nodes.items():
+            for requirement in requires:
+                if requirement not in self._nodes:
+                    raise SchedulerError(f"{name} requires unknown node {requirement}")
+
+        # Kahn's algorithm: anything left over sits on a cycle
+        remaining = {name: len(requires) for name, (_, requires) in self._nodes.items()}
+        ready = [name for name, count in remaining.items() if count == 0]
+        visited = 0
+        dependents = self._dependents()
+        while ready:
+            name = ready.pop()
+            visited += 1
+            for dependent in dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        if visited != len(self._nodes):
+            cyclic = sorted(name for name, count in remaining.items() if count > 0)
+            raise SchedulerError(f"Dependency cycle between: {', '.join(cyclic)}")
+
+    def _dependents(self) -> Dict[str, List[str]]:
+        dependents = {name: [] for name in self._nodes}
+        for name, (_, requires) in self._nodes.items():
+            for requirement in requires:
+                dependents[requirement].append(name)
+        return dependents
+
+    def run(self, on_complete: Optional[Callable[[NodeResult], None]] = None) -> Dict[str, NodeResult]:
+        """Execute the DAG; on_complete is called in declaration order
+
+        A node whose requirement raised is skipped and marked with the
+        failed requirement's error. Callbacks are released in the order
+        nodes were added, as soon as every earlier node has finished, so
+        output stays deterministic even though execution is concurrent.
+        """
+        self._validate()
+        results = {name: NodeResult(name) for name in self._order}
+        waiting = {name: set(requires) for name, (_, requires) in self._nodes.items()}
+        dependents = self._dependents()
+        released = 0
+
+        def execute(name: str):
+            result = results[name]
+            result.started = time.perf_counter()
+            try:
+                result.value = self._nodes[name][0]()
+            except Exception as e:
+                result.error = e
+            finally:
+                result.finished = time.perf_counter()
+            return name
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = set()
+
+            def submit_ready():
+                for name in self._order:
+                    if name in waiting and not waiting[name]:
+                        del waiting[name]
+                        pending.add(executor.submit(execute, name))
+
+            submit_ready()
+            done_names = set()
+            while pending or waiting:
+                if not pending:
+                    # Only reachable if every remaining node was blocked by a failure
+                    break
+                finished, pending_left = wait(pending, return_when=FIRST_COMPLETED)
+                pending.clear()
+                pending.update(pending_left)
+                for future in finished:
+                    name = future.result()
+                    done_names.add(name)
+                    failed = results[name].error is not None or results[name].skipped
+                    for dependent in dependents[name]:
+                        if dependent not in waiting:
+                            continue
+                        if failed:
+                            self._skip(dependent, results[name], results, waiting, dependents, done_names)
+                        else:
+                            waiting[dependent].discard(name)
+                submit_ready()
+
+                while released < len(self._order) and self._order[released] in done_names:
+                    if on_complete is not None:
+                        on_complete(results[self._order[released]])
+                    released += 1
+
+        for name in self._order[released:]:
+            if on_complete is not None:
+                on_complete(results[name])
+        return results
+
+    def _skip(self, name: str, cause: NodeResult, results: Dict[str, NodeResult],
+              waiting: Dict[str, set], dependents: Dict[str, List[str]], done_names: set):
+        """Mark a node (and everything downstream) as skipped"""
+        del waiting[name]
+        result = results[name]
+        result.skipped = True
+        result.error = SchedulerError(f"requirement {cause.name} failed: {cause.error}")
+        done_names.add(name)
+        for dependent in dependents[name]:
+            if dependent in waiting:
+                self._skip(dependent, result, results, waiting, dependents, done_names)
+
+    @staticmethod
+    def critical_path(results: Dict[str, NodeResult], requires: Dict[str, List[str]]) -> List[str]:
+        """Longest chain of node durations through the dependency graph"""
+        best = {}
+
+        def longest(name: str):
+            if name not in best:
+                chain = max((longest(requirement) for requirement in requires.get(name, [])),
+                            key=lambda item: item[0], default=(0.0, []))
+                best[name] = (chain[0] + results[name].duration, chain[1] + [name])
+            return best[name]
+
+        return max((longest(name) for name in results), key=lambda item: item[0], default=(0.0, []))[1]
+
+    def requirements(self) -> Dict[str, List[str]]:
+        return {name: list(requires) for name, (_, requires) in self._nodes.items()}
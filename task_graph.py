@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Task dependency graph analysis
+The tasks collection is indexed once into per-project adjacency lists
+(blocker -> blocked); each project is then ordered with Kahn's algorithm,
+its critical path weighted by estimatedHours is found in the same pass,
+and whatever Kahn cannot order is split into cycles with Tarjan's SCCs.
+Only projects touched by changed tasks are recomputed on the next load.
+"""
+
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from referential_integrity import reference_values
+
+NO_PROJECT = '(no project)'
+
+
+def _hours(value: Any) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+        return float(value)
+    return 0.0
+
+
+class TaskNode:
+    """The fields of a task the graph depends on; equal nodes need no recompute"""
+    __slots__ = ('project', 'blocked_by', 'blocks', 'subtasks', 'parent', 'hours')
+
+    def __init__(self, record: Dict[str, Any]):
+        self.project = str(record.get('projectId') or NO_PROJECT)
+        self.blocked_by = frozenset(reference_values(record.get('blockedBy')))
+        self.blocks = frozenset(reference_values(record.get('blocks')))
+        self.subtasks = frozenset(reference_values(record.get('subtasks')))
+        parent = record.get('parentTask')
+        self.parent = str(parent) if isinstance(parent, (str, int)) and parent != '' else None
+        self.hours = _hours(record.get('estimatedHours'))
+
+    def __eq__(self, other: Any) -> bool:
+        return (isinstance(other, TaskNode) and self.project == other.project and self.hours == other.hours
+                and self.parent == other.parent and self.blocked_by == other.blocked_by
+                and self.blocks == other.blocks and self.subtasks == other.subtasks)
+
+    def neighbours(self) -> Iterable[str]:
+        yield from self.blocked_by
+        yield from self.blocks
+        yield from self.subtasks
+        if self.parent is not None:
+            yield self.parent
+
+
+class ProjectGraph:
+    """Analysis of one project's tasks"""
+    __slots__ = ('project', 'tasks', 'edges', 'order', 'critical_path', 'critical_hours', 'cycles',
+                 'cyclic_tasks', 'asymmetric', 'missing', 'cross_project')
+
+    def __init__(self, project: str):
+        self.project = project
+        self.tasks = 0
+        self.edges = 0
+        self.order = []
+        self.critical_path = []
+        self.critical_hours = 0.0
+        self.cycles = []
+        self.cyclic_tasks = 0
+        self.asymmetric = []
+        self.missing = []
+        self.cross_project = 0
+
+    @property
+    def healthy(self) -> bool:
+        return not (self.cycles or self.asymmetric or self.missing)
+
+    def summary(self, sample_size: int = 5) -> Dict[str, Any]:
+        return {
+            'tasks': self.tasks,
+            'edges': self.edges,
+            'ordered': len(self.order),
+            'order': self.order[:sample_size],
+            'critical_path': self.critical_path[:sample_size],
+            'critical_length': len(self.critical_path),
+            'critical_hours': self.critical_hours,
+            'cycles': [cycle[:sample_size] for cycle in self.cycles[:sample_size]],
+            'cyclic_tasks': self.cyclic_tasks,
+            'asymmetric': [f"{source}.{field} → {target}" for source, field, target in self.asymmetric[:sample_size]],
+            'asymmetric_count': len(self.asymmetric),
+            'missing': [f"{source} → {target}" for source, target in self.missing[:sample_size]],
+            'missing_count': len(self.missing),
+            'cross_project_edges': self.cross_project
+        }
+
+
+def strongly_connected(nodes: Iterable[str], adjacency: Dict[str, List[str]]) -> List[List[str]]:
+    """Tarjan's SCCs of the subgraph induced by nodes, iteratively (no recursion limit)"""
+    nodes = list(nodes)
+    members = set(nodes)
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    components = []
+    counter = 0
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(adjacency.get(root, ())))]
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in members:
+                    continue
+                if child not in index:
+                    index[child] = low[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(adjacency.get(child, ()))))
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
+
+
+class TaskGraph:
+    """Adjacency index over the tasks collection, analysed per projectId
+
+    load() (or update()/remove()) marks the projects of changed tasks and of
+    their neighbours dirty; analyze() recomputes only those, so a re-run
+    after a few edits costs the size of the affected projects.
+    """
+
+    def __init__(self):
+        self.tasks = {}
+        self._members = {}
+        self._referrers = {}
+        self._results = {}
+        self._dirty = set()
+        self.recomputed = 0
+
+    def _touch(self, task_id: str, node: Optional[TaskNode]):
+        """Mark every project whose analysis reads this task dirty"""
+        if node is not None:
+            self._dirty.add(node.project)
+            for neighbour in node.neighbours():
+                other = self.tasks.get(neighbour)
+                if other is not None:
+                    self._dirty.add(other.project)
+        # Tasks listing this one, even while it was missing
+        for referrer in self._referrers.get(task_id, ()):
+            other = self.tasks.get(referrer)
+            if other is not None:
+                self._dirty.add(other.project)
+
+    def _discard(self, task_id: str, node: TaskNode):
+        members = self._members.get(node.project)
+        if members is not None:
+            members.pop(task_id, None)
+            if not members:
+                del self._members[node.project]
+        for neighbour in node.neighbours():
+            referrers = self._referrers.get(neighbour)
+            if referrers is not None:
+                referrers.discard(task_id)
+                if not referrers:
+                    del self._referrers[neighbour]
+
+    def update(self, task_id: str, record: Any) -> bool:
+        """Index one task; returns whether anything the graph depends on changed"""
+        if not isinstance(record, dict):
+            return self.remove(task_id)
+        node = TaskNode(record)
+        old = self.tasks.get(task_id)
+        if old == node:
+            return False
+        # Asymmetry and missing-task checks of neighbours read this task, so their projects change too
+        self._touch(task_id, old)
+        if old is not None:
+            self._discard(task_id, old)
+        self.tasks[task_id] = node
+        self._members.setdefault(node.project, {})[task_id] = None
+        for neighbour in node.neighbours():
+            self._referrers.setdefault(neighbour, set()).add(task_id)
+        self._touch(task_id, node)
+        return True
+
+    def remove(self, task_id: str) -> bool:
+        old = self.tasks.get(task_id)
+        if old is None:
+            return False
+        self._discard(task_id, old)
+        del self.tasks[task_id]
+        self._touch(task_id, old)
+        return True
+
+    def load(self, items: Iterable[Tuple[str, Any]]) -> int:
+        """Sync the index with a full read of the collection; returns the number of changed tasks"""
+        changed = 0
+        seen = set()
+        for task_id, record in items:
+            seen.add(task_id)
+            changed += self.update(task_id, record)
+        for task_id in [task_id for task_id in self.tasks if task_id not in seen]:
+            changed += self.remove(task_id)
+        return changed
+
+    def analyze(self) -> Dict[str, ProjectGraph]:
+        """Recompute the dirty projects and return every project's analysis"""
+        self.recomputed = 0
+        for project in self._dirty:
+            if project in self._members:
+                self._results[project] = self._analyze_project(project)
+                self.recomputed += 1
+            else:
+                self._results.pop(project, None)
+        self._dirty.clear()
+        return dict(self._results)
+
+    def _analyze_project(self, project: str) -> ProjectGraph:
+        tasks = self.tasks
+        members = self._members[project]
+        graph = ProjectGraph(project)
+        graph.tasks = len(members)
+
+        # One pass: blocker -> blocked edges within the project, plus the consistency checks
+        edges = set()
+        for task_id in members:
+            node = tasks[task_id]
+            for blocker in node.blocked_by:
+                other = tasks.get(blocker)
+                if other is None:
+                    graph.missing.append((task_id, blocker))
+                    continue
+                edges.add((blocker, task_id))
+                if task_id not in other.blocks:
+                    graph.asymmetric.append((task_id, 'blockedBy', blocker))
+            for blocked in node.blocks:
+                other = tasks.get(blocked)
+                if other is None:
+                    graph.missing.append((task_id, blocked))
+                    continue
+                edges.add((task_id, blocked))
+                if task_id not in other.blocked_by:
+                    graph.asymmetric.append((task_id, 'blocks', blocked))
+            for subtask in node.subtasks:
+                other = tasks.get(subtask)
+                if other is None:
+                    graph.missing.append((task_id, subtask))
+                elif other.parent != task_id:
+                    graph.asymmetric.append((task_id, 'subtasks', subtask))
+            if node.parent is not None:
+                other = tasks.get(node.parent)
+                if other is None:
+                    graph.missing.append((task_id, node.parent))
+                elif task_id not in other.subtasks:
+                    graph.asymmetric.append((task_id, 'parentTask', node.parent))
+
+        adjacency = {}
+        indegree = dict.fromkeys(members, 0)
+        for source, target in edges:
+            if source not in members or target not in members:
+                graph.cross_project += 1
+                continue
+            adjacency.setdefault(source, []).append(target)
+            indegree[target] += 1
+            graph.edges += 1
+
+        # Kahn's order; the longest-hours chain into each task is settled when it is dequeued
+        best_in = dict.fromkeys(members, 0.0)
+        predecessor = {}
+        finish = {}
+        queue = deque(task_id for task_id, degree in indegree.items() if degree == 0)
+        while queue:
+            task_id = queue.popleft()
+            graph.order.append(task_id)
+            finish[task_id] = best_in[task_id] + tasks[task_id].hours
+            for blocked in adjacency.get(task_id, ()):
+                if blocked not in predecessor or finish[task_id] > best_in[blocked]:
+                    best_in[blocked] = finish[task_id]
+                    predecessor[blocked] = task_id
+                indegree[blocked] -= 1
+                if indegree[blocked] == 0:
+                    queue.append(blocked)
+
+        if finish:
+            end = max(finish, key=finish.get)
+            graph.critical_hours = round(finish[end], 2)
+            path = [end]
+            while path[-1] in predecessor:
+                path.append(predecessor[path[-1]])
+            graph.critical_path = path[::-1]
+
+        # Tasks Kahn could not order are in a cycle or wait on one
+        if len(graph.order) < len(members):
+            unordered = [task_id for task_id, degree in indegree.items() if degree > 0]
+            for component in strongly_connected(unordered, adjacency):
+                if len(component) > 1 or component[0] in adjacency.get(component[0], ()):
+                    graph.cycles.append(sorted(component))
+                    graph.cyclic_tasks += len(component)
+            graph.cycles.sort(key=lambda cycle: (-len(cycle), cycle))
+        return graph
+
+    def summary(self, sample_size: int = 5, project_limit: int = 20) -> Dict[str, Any]:
+        """Totals plus at most project_limit projects: unhealthy ones first, then the longest critical paths"""
+        results = self._results
+        unhealthy = sorted(project for project, graph in results.items() if not graph.healthy)
+        longest = sorted((project for project, graph in results.items() if graph.healthy),
+                         key=lambda project: (-results[project].critical_hours, project))
+        shown = (unhealthy + longest)[:project_limit]
+        return {
+            'tasks': len(self.tasks),
+            'projects': len(results),
+            'unhealthy_projects': len(unhealthy),
+            'edges': sum(graph.edges for graph in results.values()),
+            'cycles': sum(len(graph.cycles) for graph in results.values()),
+            'asymmetric': sum(len(graph.asymmetric) for graph in results.values()),
+            'missing': sum(len(graph.missing) for graph in results.values()),
+            'per_project': {project: results[project].summary(sample_size) for project in shown}
+        }
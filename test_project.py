@@ -9,19 +9,35 @@ import json
 import time
 import sys
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import firebase_admin
 from firebase_admin import credentials, db, auth
 import os
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from result_recorder import ResultRecorder, Status
+from report_stream import NDJSONReportWriter
+from source_index import SourceIndex
+from lockfile_index import LockfileIndex
 
 class DeviumProjectTester:
-    def __init__(self):
-        self.results = {
-            'passed': [],
-            'failed': [],
-            'warnings': [],
-            'timestamp': datetime.now().isoformat()
-        }
+    # Substrings the static checks look for, matched in one pass per source file
+    ROLE_NAMES = ['admin', 'manager', 'developer', 'tester']
+    SOURCE_PATTERNS = ['ProtectedRoute', 'allowedRoles']
+
+    def __init__(self, max_workers: int = 8, summary_only: bool = False,
+                 max_lines_per_second: int = None, report_path: str = 'test_report.ndjson',
+                 json_report: bool = True):
+        self.timestamp = datetime.now().isoformat()
+        
+        # Results stream to NDJSON as they are logged; test_report.json is optional
+        self.report_path = report_path
+        self.json_report = json_report
+        self.report_writer = None
+        if report_path:
+            self.report_writer = NDJSONReportWriter(report_path, metadata={'timestamp': self.timestamp})
+        self.recorder = ResultRecorder(summary_only=summary_only, max_lines_per_second=max_lines_per_second,
+                                       sink=self.report_writer)
         
         # Firebase configuration from .env
         self.firebase_config = {
@@ -35,6 +51,15 @@ class DeviumProjectTester:
             "measurementId": "G-LDXSYDKT2X"
         }
         
+        # Upper bound on concurrent Firebase reads (1 = sequential)
+        self.max_workers = max(1, max_workers)
+        
+        # Source files are scanned once for every static-check pattern; matches are cached on disk
+        self.source_index = None
+        
+        # package-lock.json is indexed once per content hash
+        self.lockfile_index = None
+        
         # Initialize Firebase Admin SDK with public access
         try:
             if not firebase_admin._apps:
@@ -51,34 +76,40 @@ class DeviumProjectTester:
 
     def log_result(self, status: str, message: str, test_name: str = ""):
         """Log test results"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {status} {message}"
-        
-        if test_name:
-            log_entry = f"[{timestamp}] {status} [{test_name}] {message}"
-        
-        print(log_entry)
+        self.recorder.record(status, message, test_name)
+
+    def print_section(self, title: str):
+        """Print a test section header in order with buffered results"""
+        self.recorder.echo("\n" + "="*50)
+        self.recorder.echo(title)
+        self.recorder.echo("="*50)
+
+    def _get_child(self, path: str):
+        """Read a child reference shallowly, returning (data, error) instead of raising"""
+        try:
+            return self.db.child(path).get(shallow=True), None
+        except Exception as e:
+            return None, e
+
+    def fetch_many(self, paths: List[str]) -> List[Any]:
+        """Read several child paths concurrently, returning results in input order"""
+        if self.max_workers == 1 or len(paths) <= 1:
+            return [self._get_child(path) for path in paths]
         
-        if "✅" in status:
-            self.results['passed'].append({"test": test_name, "message": message})
-        elif "❌" in status:
-            self.results['failed'].append({"test": test_name, "message": message})
-        elif "⚠️" in status:
-            self.results['warnings'].append({"test": test_name, "message": message})
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(paths))) as executor:
+            return list(executor.map(self._get_child, paths))
 
     def test_firebase_connection(self):
         """Test Firebase Realtime Database connection"""
-        print("\n" + "="*50)
-        print("🔥 TESTING FIREBASE CONNECTION")
-        print("="*50)
+        self.print_section("🔥 TESTING FIREBASE CONNECTION")
         
         if not self.db:
             self.log_result("❌", "Firebase not initialized", "Firebase Connection")
             return
         
         try:
-            # Test root access
-            root = self.db.get()
+            # Test root access (shallow: only the top-level keys, not the whole tree)
+            root = self.db.get(shallow=True)
             if root is not None:
                 self.log_result("✅", "Successfully connected to Firebase root", "Firebase Connection")
                 
@@ -87,20 +118,19 @@ class DeviumProjectTester:
                     collections = list(root.keys())
                     self.log_result("✅", f"Found collections: {collections}", "Firebase Collections")
                     
-                    # Test each collection
-                    for collection in collections:
-                        try:
-                            collection_data = self.db.child(collection).get()
-                            if collection_data is not None:
-                                if isinstance(collection_data, dict):
-                                    count = len(collection_data)
-                                    self.log_result("✅", f"Collection '{collection}' has {count} items", "Collection Check")
-                                else:
-                                    self.log_result("✅", f"Collection '{collection}' exists", "Collection Check")
+                    # Count each collection (shallow reads in parallel, logged in key order)
+                    collection_results = self.fetch_many(collections)
+                    for collection, (collection_data, error) in zip(collections, collection_results):
+                        if error is not None:
+                            self.log_result("❌", f"Failed to access collection '{collection}': {str(error)}", "Collection Check")
+                        elif collection_data is not None:
+                            if isinstance(collection_data, dict):
+                                count = len(collection_data)
+                                self.log_result("✅", f"Collection '{collection}' has {count} items", "Collection Check")
                             else:
-                                self.log_result("⚠️", f"Collection '{collection}' is empty", "Collection Check")
-                        except Exception as e:
-                            self.log_result("❌", f"Failed to access collection '{collection}': {str(e)}", "Collection Check")
+                                self.log_result("✅", f"Collection '{collection}' exists", "Collection Check")
+                        else:
+                            self.log_result("⚠️", f"Collection '{collection}' is empty", "Collection Check")
                 else:
                     self.log_result("⚠️", "Root data is not a dictionary", "Firebase Structure")
             else:
@@ -111,9 +141,7 @@ class DeviumProjectTester:
 
     def test_user_roles(self):
         """Test user roles and authentication"""
-        print("\n" + "="*50)
-        print("👥 TESTING USER ROLES & AUTHENTICATION")
-        print("="*50)
+        self.print_section("👥 TESTING USER ROLES & AUTHENTICATION")
         
         if not self.db:
             self.log_result("❌", "Firebase not available", "User Roles")
@@ -152,9 +180,7 @@ class DeviumProjectTester:
 
     def test_teams_structure(self):
         """Test teams and team members"""
-        print("\n" + "="*50)
-        print("🏢 TESTING TEAMS STRUCTURE")
-        print("="*50)
+        self.print_section("🏢 TESTING TEAMS STRUCTURE")
         
         if not self.db:
             self.log_result("❌", "Firebase not available", "Teams Structure")
@@ -189,9 +215,7 @@ class DeviumProjectTester:
 
     def test_projects_structure(self):
         """Test projects and their assignments"""
-        print("\n" + "="*50)
-        print("📋 TESTING PROJECTS STRUCTURE")
-        print("="*50)
+        self.print_section("📋 TESTING PROJECTS STRUCTURE")
         
         if not self.db:
             self.log_result("❌", "Firebase not available", "Projects Structure")
@@ -228,9 +252,7 @@ class DeviumProjectTester:
 
     def test_chat_system(self):
         """Test chat system functionality"""
-        print("\n" + "="*50)
-        print("💬 TESTING CHAT SYSTEM")
-        print("="*50)
+        self.print_section("💬 TESTING CHAT SYSTEM")
         
         if not self.db:
             self.log_result("❌", "Firebase not available", "Chat System")
@@ -274,9 +296,7 @@ class DeviumProjectTester:
 
     def test_dependencies(self):
         """Test project dependencies and packages"""
-        print("\n" + "="*50)
-        print("📦 TESTING DEPENDENCIES")
-        print("="*50)
+        self.print_section("📦 TESTING DEPENDENCIES")
         
         # Check package.json
         try:
@@ -306,12 +326,44 @@ class DeviumProjectTester:
                 
         except Exception as e:
             self.log_result("❌", f"Package.json test failed: {str(e)}", "Dependencies")
+        
+        # Check what package-lock.json actually installs
+        try:
+            lockfile = self.load_lockfile_index()
+            if lockfile is None:
+                self.log_result("⚠️", "package-lock.json not found, skipping lockfile checks", "Lockfile")
+                return
+            
+            source = "cached index" if lockfile.from_cache else "parsed"
+            self.log_result("✅", f"Lockfile installs {lockfile.install_count} packages "
+                            f"({len(lockfile.versions)} unique, {source})", "Lockfile")
+            
+            for dep in ['react', 'firebase', '@mui/material', 'react-router-dom', 'notistack']:
+                version = lockfile.resolved_version(dep)
+                if version:
+                    self.log_result("✅", f"Resolved {dep}@{version} "
+                                    f"({len(lockfile.transitive_dependencies([dep]))} transitive packages)",
+                                    "Resolved Versions")
+                else:
+                    self.log_result("❌", f"{dep} is not in package-lock.json", "Resolved Versions")
+            
+            duplicates = lockfile.duplicates()
+            if duplicates:
+                self.log_result("⚠️", f"{len(duplicates)} packages installed at multiple versions: "
+                                f"{', '.join(sorted(duplicates)[:5])}", "Duplicate Versions")
+            else:
+                self.log_result("✅", "No packages installed at multiple versions", "Duplicate Versions")
+            
+            transitive = lockfile.transitive_dependencies(lockfile.root.get('dependencies', {}))
+            self.log_result("✅", f"Production dependencies pull in {len(transitive)} transitive packages",
+                            "Transitive Size")
+                
+        except Exception as e:
+            self.log_result("❌", f"Lockfile test failed: {str(e)}", "Lockfile")
 
     def test_file_structure(self):
         """Test project file structure"""
-        print("\n" + "="*50)
-        print("📁 TESTING FILE STRUCTURE")
-        print("="*50)
+        self.print_section("📁 TESTING FILE STRUCTURE")
         
         critical_files = [
             'src/App.tsx',
@@ -331,31 +383,27 @@ class DeviumProjectTester:
 
     def test_role_based_routing(self):
         """Test role-based routing configuration"""
-        print("\n" + "="*50)
-        print("🛣️ TESTING ROLE-BASED ROUTING")
-        print("="*50)
+        self.print_section("🛣️ TESTING ROLE-BASED ROUTING")
         
         try:
-            with open('src/App.tsx', 'r') as f:
-                app_content = f.read()
+            source_index = self.load_source_index()
             
             # Check for ProtectedRoute component
-            if 'ProtectedRoute' in app_content:
+            if source_index.contains('src/App.tsx', 'ProtectedRoute'):
                 self.log_result("✅", "ProtectedRoute component found", "Routing Configuration")
             else:
                 self.log_result("❌", "ProtectedRoute component not found", "Routing Configuration")
             
             # Check for role-based access
-            if 'allowedRoles' in app_content:
+            if source_index.contains('src/App.tsx', 'allowedRoles'):
                 self.log_result("✅", "Role-based access control implemented", "Routing Configuration")
             else:
                 self.log_result("❌", "Role-based access control not found", "Routing Configuration")
             
             # Check for different role routes
-            roles = ['admin', 'manager', 'developer', 'tester']
             found_roles = []
-            for role in roles:
-                if role in app_content.lower():
+            for role in self.ROLE_NAMES:
+                if source_index.contains('src/App.tsx', role, ignore_case=True):
                     found_roles.append(role)
             
             if found_roles:
@@ -366,12 +414,27 @@ class DeviumProjectTester:
         except Exception as e:
             self.log_result("❌", f"Role-based routing test failed: {str(e)}", "Routing Configuration")
 
+    def load_source_index(self) -> SourceIndex:
+        """Scan src/ once for every pattern the static checks need"""
+        if self.source_index is None:
+            self.source_index = SourceIndex('src', self.SOURCE_PATTERNS, ignore_case_patterns=self.ROLE_NAMES,
+                                            cache_path=os.path.join('.devium_cache', 'source_index_admin.json'),
+                                            max_workers=self.max_workers).build()
+        return self.source_index
+
+    def load_lockfile_index(self) -> Optional[LockfileIndex]:
+        """Index package-lock.json, reusing the cached index while its hash is unchanged"""
+        if self.lockfile_index is None and os.path.exists('package-lock.json'):
+            self.lockfile_index = LockfileIndex.load('package-lock.json',
+                                                     os.path.join('.devium_cache', 'lockfile_index_admin.json'))
+        return self.lockfile_index
+
     def run_all_tests(self):
         """Run all tests"""
-        print("🚀 STARTING COMPREHENSIVE DEVIUM PROJECT TEST")
-        print("=" * 60)
-        print(f"Test started at: {self.results['timestamp']}")
-        print("=" * 60)
+        self.recorder.echo("🚀 STARTING COMPREHENSIVE DEVIUM PROJECT TEST")
+        self.recorder.echo("=" * 60)
+        self.recorder.echo(f"Test started at: {self.timestamp}")
+        self.recorder.echo("=" * 60)
         
         # Run all test suites
         self.test_firebase_connection()
@@ -388,13 +451,14 @@ class DeviumProjectTester:
 
     def generate_report(self):
         """Generate final test report"""
+        self.recorder.flush()
         print("\n" + "="*60)
         print("📊 FINAL TEST REPORT")
         print("="*60)
         
-        passed_count = len(self.results['passed'])
-        failed_count = len(self.results['failed'])
-        warning_count = len(self.results['warnings'])
+        passed_count = self.recorder.count(Status.PASSED)
+        failed_count = self.recorder.count(Status.FAILED)
+        warning_count = self.recorder.count(Status.WARNING)
         total_tests = passed_count + failed_count + warning_count
         
         print(f"Total Tests: {total_tests}")
@@ -416,26 +480,52 @@ class DeviumProjectTester:
                 'warnings': warning_count,
                 'success_rate': (passed_count / total_tests * 100) if total_tests > 0 else 0
             },
-            'details': self.results
+            'details': dict(self.recorder.details(), timestamp=self.timestamp)
         }
         
-        with open('test_report.json', 'w') as f:
-            json.dump(report_data, f, indent=2)
+        if self.report_writer is not None:
+            self.report_writer.write_summary({key: value for key, value in report_data.items() if key != 'details'})
+            print(f"\n📄 Streaming report saved to: {self.report_path}")
         
-        print(f"\n📄 Detailed report saved to: test_report.json")
+        if self.json_report:
+            with open('test_report.json', 'w') as f:
+                json.dump(report_data, f, indent=2)
+            
+            print(f"\n📄 Detailed report saved to: test_report.json")
         
         # Show failed tests if any
-        if self.results['failed']:
+        failures = self.recorder.records(Status.FAILED)
+        if failures:
             print("\n❌ FAILED TESTS:")
-            for failure in self.results['failed']:
-                print(f"  - [{failure['test']}] {failure['message']}")
+            for failure in failures:
+                print(f"  - [{failure.test}] {failure.message}")
+            if len(failures) < failed_count:
+                print(f"  ... showing first {len(failures)} of {failed_count}")
         
         # Show warnings if any
-        if self.results['warnings']:
+        warnings = self.recorder.records(Status.WARNING)
+        if warnings:
             print("\n⚠️ WARNINGS:")
-            for warning in self.results['warnings']:
-                print(f"  - [{warning['test']}] {warning['message']}")
+            for warning in warnings:
+                print(f"  - [{warning.test}] {warning.message}")
+            if len(warnings) < warning_count:
+                print(f"  ... showing first {len(warnings)} of {warning_count}")
 
 if __name__ == "__main__":
-    tester = DeviumProjectTester()
+    parser = argparse.ArgumentParser(description="Devium project tester (Firebase Admin SDK)")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="maximum concurrent Firebase reads (1 = sequential)")
+    parser.add_argument("--summary-only", action="store_true",
+                        help="keep counters and a sample of results instead of every result")
+    parser.add_argument("--max-lines-per-second", type=int, default=None,
+                        help="rate-limit console result lines")
+    parser.add_argument("--report", default="test_report.ndjson",
+                        help="NDJSON report written while the tests run")
+    parser.add_argument("--no-json-report", action="store_true",
+                        help="skip writing test_report.json at the end")
+    args = parser.parse_args()
+    
+    tester = DeviumProjectTester(max_workers=args.workers, summary_only=args.summary_only,
+                                 max_lines_per_second=args.max_lines_per_second,
+                                 report_path=args.report, json_report=not args.no_json_report)
     tester.run_all_tests()
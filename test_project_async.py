@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Asyncio Test Script for Devium Project using REST API
+Runs the REST tester's checks on one event loop with an aiohttp pool, so
+hundreds of reads can be in flight from a single process
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Dict, List
+
+from firebase_async import AsyncFirebaseTransport, aiter_key_pages
+from referential_integrity import IntegrityChecker
+from rules_validator import RulesValidator
+import columnar_analytics
+from result_recorder import ResultGroup
+from test_project_simple import DeviumProjectTester
+
+
+class AsyncDeviumProjectTester(DeviumProjectTester):
+    """DeviumProjectTester whose Firebase suites run as coroutines
+
+    The synchronous methods (run_all_tests, test_*, make_firebase_request)
+    stay available as thin asyncio.run() wrappers. Snapshot, stream and
+    cache modes belong to the requests backend and are not supported here.
+    """
+
+    def __init__(self, *args, max_in_flight: int = 100, timeout: float = 10, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.snapshot is not None or self.stream or self.cache is not None:
+            raise ValueError("The async backend does not support snapshot, stream or cache mode")
+
+        # Reuse the trace hooks built for the requests transport, then drop its session
+        trace_hook = self.transport.trace_hook
+        self.transport.session.close()
+        self.transport = AsyncFirebaseTransport(
+            self.base_url,
+            self.api_key,
+            pool_size=max(self.max_workers, max_in_flight),
+            max_in_flight=max_in_flight,
+            max_retries=self.transport.max_retries,
+            timeout=timeout,
+            trace_hook=trace_hook
+        )
+        self.max_in_flight = max_in_flight
+
+        # Every suite is a task on the same loop
+        self.suite_workers = len(self.SUITES)
+
+    def _run_sync(self, coroutine_function, *args) -> Any:
+        """Run one coroutine on a fresh event loop with its own connection pool"""
+        async def runner():
+            try:
+                return await coroutine_function(*args)
+            finally:
+                await self.transport.aclose()
+        return asyncio.run(runner())
+
+    def make_firebase_request(self, path: str, shallow: bool = False) -> Dict:
+        return self._run_sync(self.make_firebase_request_async, path, shallow)
+
+    def fetch_many(self, paths: List[str], shallow: bool = False) -> List[Any]:
+        return self._run_sync(self.fetch_many_async, paths, shallow)
+
+    async def make_firebase_request_async(self, path: str, shallow: bool = False) -> Dict:
+        """Make request to Firebase REST API"""
+        return await self._fetch_path_async(path, {'shallow': 'true'} if shallow else None)
+
+    async def _fetch_path_async(self, path: str, params: Dict = None) -> Dict:
+        try:
+            response = await self.transport.get(path, params=params)
+
+            if response.status_code == 200:
+                return response.json()
+            else:
+                self.log_result("❌", f"Firebase API request failed: {response.status_code}", "API Request")
+                return None
+
+        except Exception as e:
+            self.log_result("❌", f"Firebase API request error: {str(e) or type(e).__name__}", "API Request")
+            return None
+
+    async def fetch_many_async(self, paths: List[str], shallow: bool = False) -> List[Any]:
+        """Fetch several paths concurrently (bounded by the transport's semaphore), in input order"""
+        return list(await asyncio.gather(*(self.make_firebase_request_async(path, shallow) for path in paths)))
+
+    def iter_collection_async(self, path: str):
+        """Async iterator of (key, record) pairs, one page at a time"""
+        return aiter_key_pages(self._fetch_path_async, path, self.page_size)
+
+    async def count_children_async(self, path: str) -> Any:
+        data = await self.make_firebase_request_async(path, shallow=True)
+        if isinstance(data, dict):
+            return len(data)
+        return None
+
+    async def count_messages_async(self, conversation_ids: List[str]) -> Dict[str, int]:
+        """Count messages per conversation with concurrent shallow queries"""
+        threads = await self.make_firebase_request_async('messages', shallow=True)
+        if not isinstance(threads, dict):
+            return {}
+
+        with_messages = [conv_id for conv_id in conversation_ids if conv_id in threads]
+        results = await self.fetch_many_async([f'messages/{conv_id}' for conv_id in with_messages], shallow=True)
+        return {
+            conv_id: len(messages)
+            for conv_id, messages in zip(with_messages, results)
+            if isinstance(messages, dict)
+        }
+
+    async def test_firebase_connection_async(self):
+        self.print_section("🔥 TESTING FIREBASE CONNECTION")
+
+        try:
+            root_data = await self.make_firebase_request_async("", shallow=True)
+
+            if root_data is not None:
+                self.log_result("✅", "Successfully connected to Firebase via REST API", "Firebase Connection")
+
+                if isinstance(root_data, dict):
+                    collections = list(root_data.keys())
+                    self.log_result("✅", f"Found collections: {collections}", "Firebase Collections")
+                    self.check_collections(collections, await self.fetch_many_async(collections, shallow=True))
+                else:
+                    self.log_result("⚠️", "Root data is not a dictionary", "Firebase Structure")
+            else:
+                self.log_result("❌", "Failed to connect to Firebase", "Firebase Connection")
+
+        except Exception as e:
+            self.log_result("❌", f"Firebase connection test failed: {str(e)}", "Firebase Connection")
+
+    async def test_user_roles_async(self):
+        self.print_section("👥 TESTING USER ROLES & AUTHENTICATION")
+
+        try:
+            role_counts = {'admin': 0, 'manager': 0, 'developer': 0, 'tester': 0, 'unknown': 0}
+            users_seen = 0
+
+            async for user_id, user_data in self.iter_collection_async('users'):
+                users_seen += 1
+                self.check_user(user_data, role_counts)
+
+            self.report_roles(users_seen, role_counts)
+
+        except Exception as e:
+            self.log_result("❌", f"User role test failed: {str(e)}", "User Roles")
+
+    async def test_teams_structure_async(self):
+        self.print_section("🏢 TESTING TEAMS STRUCTURE")
+
+        try:
+            total_teams = await self.count_children_async('teams')
+
+            if total_teams:
+                self.log_result("✅", f"Found {total_teams} teams", "Teams Count")
+
+                if self.count_only:
+                    return
+
+                async for team_id, team_data in self.iter_collection_async('teams'):
+                    self.check_team(team_id, team_data)
+            else:
+                self.log_result("❌", "No teams found in database", "Teams Structure")
+
+        except Exception as e:
+            self.log_result("❌", f"Teams structure test failed: {str(e)}", "Teams Structure")
+
+    async def test_projects_structure_async(self):
+        self.print_section("📋 TESTING PROJECTS STRUCTURE")
+
+        try:
+            total_projects = await self.count_children_async('projects')
+
+            if total_projects:
+                self.log_result("✅", f"Found {total_projects} projects", "Projects Count")
+
+                if self.count_only:
+                    return
+
+                async for project_id, project_data in self.iter_collection_async('projects'):
+                    self.check_project(project_id, project_data)
+            else:
+                self.log_result("❌", "No projects found in database", "Projects Structure")
+
+        except Exception as e:
+            self.log_result("❌", f"Projects structure test failed: {str(e)}", "Projects Structure")
+
+    async def test_chat_system_async(self):
+        self.print_section("💬 TESTING CHAT SYSTEM")
+
+        try:
+            total_conversations = await self.count_children_async('conversations')
+
+            if total_conversations:
+                self.log_result("✅", f"Found {total_conversations} conversations", "Chat Conversations")
+
+                conversation_names = []
+                async for conv_id, conv_data in self.iter_collection_async('conversations'):
+                    named = self.check_conversation(conv_id, conv_data)
+                    if named:
+                        conversation_names.append(named)
+
+                message_counts = await self.count_messages_async([conv_id for conv_id, _ in conversation_names])
+                self.report_message_counts(conversation_names, message_counts)
+            else:
+                self.log_result("⚠️", "No conversations found in database", "Chat System")
+
+            online_users = 0
+            users_seen = 0
+            async for user_id, user_data in self.iter_collection_async('users'):
+                users_seen += 1
+                if isinstance(user_data, dict) and user_data.get('isOnline'):
+                    online_users += 1
+
+            if users_seen:
+                self.log_result("✅", f"Users online: {online_users}", "User Presence")
+
+        except Exception as e:
+            self.log_result("❌", f"Chat system test failed: {str(e)}", "Chat System")
+
+    async def test_referential_integrity_async(self):
+        self.print_section("🔗 TESTING REFERENTIAL INTEGRITY")
+
+        try:
+            start = time.perf_counter()
+            checker = IntegrityChecker()
+
+            collections = checker.shallow_collections()
+            shallow = [keys if isinstance(keys, dict) else None for keys in await self.fetch_many_async(collections, shallow=True)]
+            for collection, keys in zip(collections, shallow):
+                checker.index(collection, keys)
+            for collection, keys in zip(collections, shallow):
+                checker.check_keys(collection, keys)
+
+            for collection in checker.record_sources():
+                async for key, record in self.iter_collection_async(collection):
+                    checker.check_record(collection, key, record)
+
+            self.report_integrity(checker, time.perf_counter() - start)
+
+        except Exception as e:
+            self.log_result("❌", f"Referential integrity test failed: {str(e)}", "Referential Integrity")
+
+    async def test_security_rules_async(self):
+        self.print_section("🛡️ TESTING DATA AGAINST SECURITY RULES")
+
+        try:
+            if not os.path.exists('firebase-rules.json'):
+                self.log_result("⚠️", "firebase-rules.json not found, skipping rule validation", "Rules Compilation")
+                return
+
+            validator = RulesValidator.load('firebase-rules.json')
+            collections = validator.collections
+            rule_count = sum(len(rules) for rules in validator.rules.values())
+            self.log_result("✅", f"Compiled {rule_count} .validate rules for {len(collections)} collections",
+                            "Rules Compilation")
+
+            async def audit(collection):
+                items = [item async for item in self.iter_collection_async(collection)]
+                return validator.validate(collection, items)
+
+            results = await asyncio.gather(*(audit(collection) for collection in collections))
+            self.report_rule_violations(validator, list(results))
+
+        except Exception as e:
+            self.log_result("❌", f"Security rules test failed: {str(e)}", "Rule Validation")
+
+    async def test_monitoring_analytics_async(self):
+        self.print_section("📈 TESTING MONITORING ANALYTICS")
+
+        try:
+            if columnar_analytics.np is None:
+                self.log_result("⚠️", "NumPy is not installed, skipping monitoring analytics", "Analytics Engine")
+                return
+
+            start = time.perf_counter()
+
+            async def read(collection):
+                return [item async for item in self.iter_collection_async(collection)]
+
+            errors, metrics, user_metrics, system_analytics = await asyncio.gather(
+                read('errors'), read('performanceMetrics'), read('userMetrics'),
+                self.make_firebase_request_async('systemAnalytics'))
+
+            loaded = time.perf_counter()
+            analytics = await asyncio.to_thread(columnar_analytics.analyze, errors, metrics, user_metrics,
+                                                system_analytics)
+            self.report_analytics(analytics, loaded - start, time.perf_counter() - loaded)
+
+        except Exception as e:
+            self.log_result("❌", f"Monitoring analytics test failed: {str(e)}", "Analytics Engine")
+
+    async def test_task_dependencies_async(self):
+        self.print_section("🧩 TESTING TASK DEPENDENCIES")
+
+        try:
+            start = time.perf_counter()
+            tasks = [item async for item in self.iter_collection_async('tasks')]
+            changed = self.task_graph.load(tasks)
+            projects = await asyncio.to_thread(self.task_graph.analyze)
+            if not projects:
+                self.task_dependencies = None
+                self.log_result("⚠️", "No tasks found in database", "Task Graph")
+                return
+
+            self.report_task_graph(self.task_graph, projects, changed, time.perf_counter() - start)
+
+        except Exception as e:
+            self.log_result("❌", f"Task dependency test failed: {str(e)}", "Task Graph")
+
+    def test_firebase_connection(self):
+        self._run_sync(self.test_firebase_connection_async)
+
+    def test_user_roles(self):
+        self._run_sync(self.test_user_roles_async)
+
+    def test_teams_structure(self):
+        self._run_sync(self.test_teams_structure_async)
+
+    def test_projects_structure(self):
+        self._run_sync(self.test_projects_structure_async)
+
+    def test_chat_system(self):
+        self._run_sync(self.test_chat_system_async)
+
+    def test_referential_integrity(self):
+        self._run_sync(self.test_referential_integrity_async)
+
+    def test_security_rules(self):
+        self._run_sync(self.test_security_rules_async)
+
+    def test_monitoring_analytics(self):
+        self._run_sync(self.test_monitoring_analytics_async)
+
+    def test_task_dependencies(self):
+        self._run_sync(self.test_task_dependencies_async)
+
+    async def _run_suite_async(self, name: str) -> ResultGroup:
+        """Run one suite in its own result group; local-file suites run in a thread"""
+        started = time.perf_counter()
+        with self.recorder.grouped(name) as group:
+            try:
+                coroutine_function = getattr(self, f'{name}_async', None)
+                if coroutine_function is not None:
+                    await coroutine_function()
+                else:
+                    await asyncio.to_thread(getattr(self, name))
+            except Exception as e:
+                self.log_result("❌", f"{name} did not complete: {str(e)}", "Suite Scheduler")
+        self.suite_timings[name] = round((time.perf_counter() - started) * 1000, 2)
+        return group
+
+    async def run_suites_async(self):
+        """Run every suite concurrently on this loop; output keeps SUITES order"""
+        start = time.perf_counter()
+        tasks = [asyncio.ensure_future(self._run_suite_async(name)) for name, _ in self.SUITES]
+        for task in tasks:
+            self.recorder.commit(await task)
+        self.suite_timings['wall'] = round((time.perf_counter() - start) * 1000, 2)
+        slowest = max((name for name, _ in self.SUITES), key=lambda name: self.suite_timings[name])
+        self.critical_path = [slowest]
+
+    async def run_all_tests_async(self):
+        """Run all tests on the current event loop"""
+        self.recorder.echo("🚀 STARTING COMPREHENSIVE DEVIUM PROJECT TEST")
+        self.recorder.echo("=" * 60)
+        self.recorder.echo(f"Test started at: {self.timestamp}")
+        self.recorder.echo(f"Backend: asyncio ({self.max_in_flight} requests in flight)")
+        self.recorder.echo("=" * 60)
+
+        async with self.transport:
+            await self.run_suites_async()
+
+        report = self.generate_report()
+        self.transport.close()
+        return report
+
+    def run_all_tests(self):
+        """Run all tests"""
+        return asyncio.run(self.run_all_tests_async())